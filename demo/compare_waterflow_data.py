@@ -67,6 +67,7 @@ def get_domoticz_data(device_id=9185):
     print("FETCHING DOMOTICZ DATA")
     print("=" * 80)
 
+    client = None
     try:
         client = create_domoticz_client(host="10.0.0.2", port=80)
         print(f"✓ Connected to Domoticz at {client.base_url}")
@@ -101,6 +102,9 @@ def get_domoticz_data(device_id=9185):
     except Exception as e:
         print(f"✗ Error fetching Domoticz data: {e}")
         return []
+    finally:
+        if client is not None:
+            client.close()
 
 
 def normalize_timestamp(ts_str):
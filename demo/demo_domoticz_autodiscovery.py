@@ -714,7 +714,8 @@ def validate_domoticz_devices(discovery_prefix, expected_device_count=13):
     logger.info("")
 
     # Validate discovered devices
-    validation = client.validate_discovery_devices(discovery_prefix)
+    with client:
+        validation = client.validate_discovery_devices(discovery_prefix)
 
     logger.info("📊 Device Summary:")
     logger.info(f"  Total devices in Domoticz: {validation['total_devices']}")
@@ -499,6 +499,8 @@ def main():
     except Exception as e:  # pylint: disable=broad-exception-caught
         logger.error(f"Error: {e}")
         sys.exit(1)
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from myuplink2mqtt.utils.myuplink_utils import (
     check_oauth_prerequisites,
+    close_session,
     create_oauth_session,
     get_device_brands,
     get_systems,
@@ -71,6 +72,7 @@ async def main():
     # Test 1: API Availability
     logger.info("Test 1: API Availability")
     api_available = await test_api_availability()
+    await close_session()
 
     # Check OAuth prerequisites before attempting OAuth test
     logger.info("Checking OAuth prerequisites...")
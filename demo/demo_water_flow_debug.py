@@ -546,6 +546,22 @@ Examples:
 
     print("✓ Connected to Domoticz\n")
 
+    try:
+        return analyze_sensor(client, args)
+    finally:
+        client.close()
+
+
+def analyze_sensor(client: DomoticzClient, args: argparse.Namespace) -> int:
+    """Analyze the water flow sensor and report any issues found.
+
+    Args:
+        client: Connected DomoticzClient instance.
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Exit code.
+    """
     # Find device
     device_id = args.device_id
     if not device_id:
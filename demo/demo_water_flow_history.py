@@ -454,6 +454,22 @@ Examples:
 
     print("✓ Connected to Domoticz server\n")
 
+    try:
+        return debug_sensor_history(client, args)
+    finally:
+        client.close()
+
+
+def debug_sensor_history(client: DomoticzClient, args: argparse.Namespace) -> int:
+    """Find the water flow sensor and display its history.
+
+    Args:
+        client: Connected DomoticzClient instance.
+        args: Parsed command line arguments.
+
+    Returns:
+        int: Exit code.
+    """
     # List all sensors if requested
     if args.list_sensors:
         list_all_flow_sensors(client)
@@ -22,6 +22,7 @@ def check_device_settings(host="10.0.0.2", port=80, device_id=9185):
     print("DOMOTICZ DEVICE SETTINGS CHECK")
     print("=" * 80)
 
+    client = None
     try:
         client = create_domoticz_client(host=host, port=port)
         print(f"✓ Connected to {host}:{port}")
@@ -101,6 +102,9 @@ def check_device_settings(host="10.0.0.2", port=80, device_id=9185):
     except Exception as e:
         print(f"✗ Error: {e}")
         return None
+    finally:
+        if client is not None:
+            client.close()
 
 
 def check_mqtt_payload():
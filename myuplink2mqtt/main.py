@@ -9,13 +9,16 @@ import argparse
 import asyncio
 import logging
 import os
+import signal
 import sys
 import time
 
 import paho.mqtt.client as mqtt
 from paho.mqtt.enums import CallbackAPIVersion
 
+from myuplink2mqtt.utils import auto_discovery_utils
 from myuplink2mqtt.utils.auto_discovery_utils import (
+    build_device_block,
     determine_entity_category,
     determine_value_type,
     publish_ha_discovery,
@@ -25,11 +28,11 @@ from myuplink2mqtt.utils.auto_discovery_utils import (
 from myuplink2mqtt.utils.myuplink_utils import (
     check_oauth_prerequisites,
     create_oauth_session,
-    get_device_details,
-    get_device_points,
+    get_devices_data,
     get_parameter_display_name,
     get_systems,
     save_api_data_to_file,
+    split_product_name,
 )
 
 # Configure logging
@@ -40,10 +43,9 @@ MQTT_BROKER_HOST = os.getenv("MQTT_BROKER_HOST", "127.0.0.1")
 MQTT_BROKER_PORT = int(os.getenv("MQTT_BROKER_PORT", "1883"))
 MQTT_USERNAME = os.getenv("MQTT_USERNAME")
 MQTT_PASSWORD = os.getenv("MQTT_PASSWORD")
-MQTT_BASE_TOPIC = os.getenv("MQTT_BASE_TOPIC", "myuplink")
 
-# Home Assistant Discovery Configuration
-HA_DISCOVERY_PREFIX = os.getenv("HA_DISCOVERY_PREFIX", "homeassistant")
+# MQTT_BASE_TOPIC and HA_DISCOVERY_PREFIX are read from auto_discovery_utils at
+# call time, so state topics always match the discovery and command topics
 
 # Poll interval in seconds (can be overridden by command line)
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "60"))  # Default: 1 minute
@@ -318,7 +320,7 @@ def publish_sensor_state(mqtt_client, system_id, parameter_id, value, enum_value
 
     """
     # State topic
-    state_topic = f"{MQTT_BASE_TOPIC}/{system_id}/{parameter_id}/value"
+    state_topic = f"{auto_discovery_utils.MQTT_BASE_TOPIC}/{system_id}/{parameter_id}/value"
 
     # If this is an enum parameter, convert numeric value to text
     state_value = value
@@ -344,7 +346,7 @@ def publish_availability(mqtt_client, system_id, available=True):
         available (bool): Whether the system is available.
 
     """
-    availability_topic = f"{MQTT_BASE_TOPIC}/{system_id}/available"
+    availability_topic = f"{auto_discovery_utils.MQTT_BASE_TOPIC}/{system_id}/available"
     payload = "online" if available else "offline"
     mqtt_client.publish(availability_topic, payload, qos=1, retain=True)
 
@@ -385,9 +387,7 @@ def process_installation_date_parameter(
         if should_send_parameter(parameter_info):
             if PUBLISH_TO_MQTT and mqtt_client is not None:
                 if send_discovery:
-                    publish_ha_discovery(
-                        mqtt_client, device_info, parameter_info, system_id, HA_DISCOVERY_PREFIX
-                    )
+                    publish_ha_discovery(mqtt_client, device_info, parameter_info, system_id)
                     discovery_sent += 1
 
                 publish_sensor_state(
@@ -422,6 +422,10 @@ def process_data_points(mqtt_client, device_info, system_id, points_data, send_d
     """
     points_published = 0
     discovery_sent = 0
+    publishing = PUBLISH_TO_MQTT and mqtt_client is not None
+
+    # Built once and shared by the discovery payloads of all this device's points
+    device_block = build_device_block(device_info) if publishing and send_discovery else None
 
     for point in points_data:
         param_id = point.get("parameterId")
@@ -436,29 +440,32 @@ def process_data_points(mqtt_client, device_info, system_id, points_data, send_d
             logger.debug(f"Skipping installation date component: {param_id}")
             continue
 
+        # Only what the state publish needs; discovery fields are added below
         parameter_info = {
             "id": point["parameterId"],
-            "name": get_parameter_display_name(point),
             "value": point["value"],
-            "unit": point.get("parameterUnit", ""),
-            "value_type": determine_value_type(point["value"]),
-            "category": determine_entity_category(
-                point["parameterId"], get_parameter_display_name(point)
-            ),
             "enum_values": point.get("enumValues", []),
             "strVal": point.get("strVal"),
         }
 
         if not should_send_parameter(parameter_info):
             logger.debug(
-                f"Skipping parameter {parameter_info['id']}: {parameter_info['name']} (filtered)"
+                f"Skipping parameter {parameter_info['id']}: "
+                f"{get_parameter_display_name(point)} (filtered)"
             )
             continue
 
-        if PUBLISH_TO_MQTT and mqtt_client is not None:
+        if publishing:
             if send_discovery:
+                display_name = get_parameter_display_name(point)
+                parameter_info["name"] = display_name
+                parameter_info["unit"] = point.get("parameterUnit", "")
+                parameter_info["value_type"] = determine_value_type(point["value"])
+                parameter_info["category"] = determine_entity_category(
+                    point["parameterId"], display_name
+                )
                 publish_ha_discovery(
-                    mqtt_client, device_info, parameter_info, system_id, HA_DISCOVERY_PREFIX
+                    mqtt_client, device_info, parameter_info, system_id, device_block=device_block
                 )
                 discovery_sent += 1
 
@@ -475,29 +482,30 @@ def process_data_points(mqtt_client, device_info, system_id, points_data, send_d
     return points_published, discovery_sent
 
 
-def process_device(myuplink, mqtt_client, system_id, device_id, send_discovery=False):
-    """Process a single device: retrieve data and publish to MQTT.
+def process_device(
+    mqtt_client, system_id, device_id, device_data, points_data, send_discovery=False
+):
+    """Process a single device: publish its retrieved data to MQTT.
 
     Args:
-        myuplink: OAuth2Session for myUplink API.
         mqtt_client: MQTT client instance or None if not publishing.
         system_id (str): System ID.
         device_id (str): Device ID.
+        device_data (dict): Device details from the API, or None if retrieval failed.
+        points_data (list): Data points from the API, or None if retrieval failed.
         send_discovery (bool): Whether to send HA discovery messages (first cycle only).
 
     Returns:
         int: Number of entities (data points) published for this device.
 
     """
-    device_data = get_device_details(myuplink, device_id)
     if device_data is None:
         logger.error(f"Could not retrieve device details for {device_id}")
         return 0
 
     device_name = device_data["product"]["name"]
     product_name = device_data["product"]["name"]
-    manufacturer = product_name.split(" ", 1)[0] if " " in product_name else "Unknown"
-    model = product_name.split(" ", 1)[1] if " " in product_name else product_name
+    manufacturer, model = split_product_name(product_name)
 
     device_info = {
         "id": device_id,
@@ -508,7 +516,6 @@ def process_device(myuplink, mqtt_client, system_id, device_id, send_discovery=F
     }
     logger.debug(f"Processing device: {device_name} ({device_id})")
 
-    points_data = get_device_points(myuplink, device_id)
     if points_data is None:
         logger.error(f"Could not retrieve data points for {device_id}")
         return 0
@@ -566,8 +573,8 @@ def show_configuration():
         [
             "",
             "📝 MQTT Topics Configuration:",
-            f"  Base Topic:        {MQTT_BASE_TOPIC}",
-            f"  HA Discovery Pfx:  {HA_DISCOVERY_PREFIX}",
+            f"  Base Topic:        {auto_discovery_utils.MQTT_BASE_TOPIC}",
+            f"  HA Discovery Pfx:  {auto_discovery_utils.HA_DISCOVERY_PREFIX}",
             "",
             "⏱️  Polling Configuration:",
             f"  Poll Interval:     {POLL_INTERVAL} seconds",
@@ -682,11 +689,12 @@ def process_poll_cycle(myuplink, mqtt_client, loop_count):
         logger.debug(f"System: {system_name} (ID: {system_id})")
         logger.debug(f"Devices: {len(system['devices'])}")
 
-        # Process each device
-        for device in system["devices"]:
-            device_id = device["id"]
+        # Fetch all devices of the system concurrently, then process them in order
+        device_ids = [device["id"] for device in system["devices"]]
+        devices_data = get_devices_data(myuplink, device_ids)
+        for device_id, (device_data, points_data) in zip(device_ids, devices_data):
             entities_published += process_device(
-                myuplink, mqtt_client, system_id, device_id, send_discovery
+                mqtt_client, system_id, device_id, device_data, points_data, send_discovery
             )
 
     return entities_published
@@ -700,8 +708,8 @@ def log_startup_info():
         logger.info(f"Starting main loop (polling every {POLL_INTERVAL} seconds)...")
 
     if PUBLISH_TO_MQTT:
-        logger.info(f"Publishing to MQTT topic base: {MQTT_BASE_TOPIC}")
-        logger.info(f"Home Assistant discovery prefix: {HA_DISCOVERY_PREFIX}")
+        logger.info(f"Publishing to MQTT topic base: {auto_discovery_utils.MQTT_BASE_TOPIC}")
+        logger.info(f"Home Assistant discovery prefix: {auto_discovery_utils.HA_DISCOVERY_PREFIX}")
     else:
         logger.warning("Debug mode: not publishing to MQTT")
 
@@ -709,6 +717,44 @@ def log_startup_info():
         logger.debug("Press Ctrl+C to stop\n")
 
 
+def install_shutdown_handlers(loop, shutdown_event):
+    """Set the shutdown event on SIGTERM/SIGINT instead of raising in the main thread.
+
+    Docker and systemd stop the process with SIGTERM, which would otherwise kill it
+    before the MQTT DISCONNECT is sent.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): Running event loop.
+        shutdown_event (asyncio.Event): Event to set when a signal is received.
+
+    """
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, shutdown_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on this platform (e.g. Windows); Ctrl+C still raises
+            # KeyboardInterrupt which is handled in main_loop
+            logger.debug(f"Signal handler for {sig.name} not supported")
+
+
+async def wait_for_shutdown(shutdown_event, timeout):
+    """Sleep until the shutdown event is set or the timeout expires.
+
+    Args:
+        shutdown_event (asyncio.Event): Event set by the signal handlers.
+        timeout (float): Maximum time to wait in seconds.
+
+    Returns:
+        bool: True if shutdown was requested, False if the timeout expired.
+
+    """
+    try:
+        await asyncio.wait_for(shutdown_event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
 async def main_loop():
     """Poll myUplink API and publish data to MQTT."""
     # Set up OAuth session
@@ -726,9 +772,12 @@ async def main_loop():
     # Log startup information
     log_startup_info()
 
+    shutdown_event = asyncio.Event()
+    install_shutdown_handlers(asyncio.get_running_loop(), shutdown_event)
+
     loop_count = 0
     try:
-        while True:
+        while not shutdown_event.is_set():
             loop_count += 1
             entities_published = process_poll_cycle(myuplink, mqtt_client, loop_count)
             logger.info(
@@ -741,7 +790,8 @@ async def main_loop():
                 break
 
             logger.debug(f"Sleeping for {POLL_INTERVAL} seconds...")
-            time.sleep(POLL_INTERVAL)
+            if await wait_for_shutdown(shutdown_event, POLL_INTERVAL):
+                logger.info("Shutdown requested (signal received)")
 
     except KeyboardInterrupt:
         logger.info("Shutdown requested by user (Ctrl+C)")
@@ -750,8 +800,9 @@ async def main_loop():
     finally:
         if PUBLISH_TO_MQTT:
             logger.info("Disconnecting from MQTT broker...")
-            mqtt_client.loop_stop()
+            # Disconnect before stopping the network loop so DISCONNECT is flushed
             mqtt_client.disconnect()
+            mqtt_client.loop_stop()
             logger.info("Disconnected")
 
     return True
@@ -759,7 +810,7 @@ async def main_loop():
 
 def main():
     """Entry point for the script."""
-    global SILENT_MODE, DEBUG_MODE, PUBLISH_TO_MQTT, POLL_INTERVAL, RUN_ONCE, DISCOVERY_PREFIX, HA_DISCOVERY_PREFIX, MQTT_BROKER_HOST, MQTT_HOST, SEND_ALL_PARAMETERS  # pylint: disable=global-statement
+    global SILENT_MODE, DEBUG_MODE, PUBLISH_TO_MQTT, POLL_INTERVAL, RUN_ONCE, DISCOVERY_PREFIX, MQTT_BROKER_HOST, MQTT_HOST, SEND_ALL_PARAMETERS  # pylint: disable=global-statement
 
     # Parse command line arguments
     args = parse_arguments()
@@ -782,7 +833,7 @@ def main():
 
     # Override discovery prefix if specified
     if args.discovery_prefix:
-        HA_DISCOVERY_PREFIX = args.discovery_prefix
+        auto_discovery_utils.HA_DISCOVERY_PREFIX = args.discovery_prefix
         DISCOVERY_PREFIX = args.discovery_prefix
 
     # Setup logging with appropriate level
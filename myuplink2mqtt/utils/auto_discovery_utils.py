@@ -7,10 +7,36 @@ MQTT discovery payloads for myUplink API devices and parameters.
 import json
 import logging
 import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+__all__ = [
+    "HA_DISCOVERY_PREFIX",
+    "MQTT_BASE_TOPIC",
+    "build_device_block",
+    "build_discovery_payload",
+    "build_enum_options",
+    "clean_enum_text",
+    "clean_parameter_name",
+    "determine_device_class",
+    "determine_entity_category",
+    "determine_value_type",
+    "get_parameter_id_to_device_class_mapping",
+    "get_unit_to_device_class_mapping",
+    "has_enum_values",
+    "normalize_unit",
+    "publish_ha_discovery",
+    "reload_config",
+]
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Topic builders read these constants at call time, so reload_config() and
+# patching them both take effect
+
 # Home Assistant Discovery Configuration
 HA_DISCOVERY_PREFIX = os.getenv("HA_DISCOVERY_PREFIX", "homeassistant")
 
@@ -18,34 +44,26 @@ HA_DISCOVERY_PREFIX = os.getenv("HA_DISCOVERY_PREFIX", "homeassistant")
 MQTT_BASE_TOPIC = os.getenv("MQTT_BASE_TOPIC", "myuplink")
 
 
-def normalize_unit(unit):
-    """Normalize unit of measurement strings.
-
-    Args:
-        unit (str): The unit string to normalize.
+def reload_config():
+    """Re-read HA_DISCOVERY_PREFIX and MQTT_BASE_TOPIC from the environment."""
+    global HA_DISCOVERY_PREFIX, MQTT_BASE_TOPIC  # pylint: disable=global-statement
+    HA_DISCOVERY_PREFIX = os.getenv("HA_DISCOVERY_PREFIX", "homeassistant")
+    MQTT_BASE_TOPIC = os.getenv("MQTT_BASE_TOPIC", "myuplink")
 
-    Returns:
-        str: Normalized unit string.
 
-    """
-    # Map non-standard units to standard representations
-    unit_normalization_map = {
+# Map non-standard units to standard representations
+_UNIT_NORMALIZATION = MappingProxyType(
+    {
         "rh%": "%",  # Relative humidity: rh% -> %
         "l/m": "l/min",  # Liters per minute: l/m -> l/min (HA compatible)
         "l/hr": "L/h",  # Liters per hour: l/hr -> L/h (HA compatible)
         "m³/h": "m³/h",  # Cubic meters per hour: already HA compatible
     }
-    return unit_normalization_map.get(unit, unit)
-
+)
 
-def get_unit_to_device_class_mapping():
-    """Get mapping of parameter units to Home Assistant device classes.
-
-    Returns:
-        dict: Dictionary mapping units to device classes.
-
-    """
-    return {
+# Parameter units to Home Assistant device classes
+_UNIT_TO_DEVICE_CLASS = MappingProxyType(
+    {
         "°C": "temperature",
         "C": "temperature",
         "°F": "temperature",
@@ -66,6 +84,83 @@ def get_unit_to_device_class_mapping():
         "L/h": "volume_flow_rate",
         "m³/h": "volume_flow_rate",
     }
+)
+
+# Specific parameter IDs to device classes (take precedence over unit mapping)
+_PARAMETER_ID_TO_DEVICE_CLASS = MappingProxyType(
+    {
+        "43161": "binary_sensor",  # Electricity add (alarm)
+        "60433": "humidity",  # Relative humidity
+        "installation_date": "date",  # Installation date (virtual parameter)
+    }
+)
+
+# Units of monotonically increasing energy counters
+_TOTAL_INCREASING_UNITS = frozenset({"kWh", "Wh", "MWh"})
+
+# Diagnostic parameters - informational only, not for control
+_DIAGNOSTIC_IDS = frozenset(
+    {
+        "43161",  # Electricity add (alarm)
+        "43437",  # Compressor active accumulated time
+        "43438",  # Compressor starts
+    }
+)
+
+# Value type names keyed by exact Python type
+_VALUE_TYPES = MappingProxyType({bool: "bool", int: "int", float: "float", str: "string"})
+
+# Topic parts shared by every parameter of one system
+_SystemTopics = namedtuple("_SystemTopics", ["parameter_prefix", "availability_topic"])
+
+# Origin block advertised with every discovery payload
+_ORIGIN = {
+    "name": "myUplink2mqtt",
+    "sw": "1.0.0",
+    "url": "https://github.com/j-b-n/myUplink2mqtt",
+}
+
+# Discovery payload fields that are identical for every entity
+_STATIC_FIELDS = MappingProxyType(
+    {
+        "availability_mode": "latest",
+        "payload_available": "online",
+        "payload_not_available": "offline",
+        "enabled_by_default": True,
+    }
+)
+
+# Line breaks deleted from enum labels, and runs of spaces collapsed in them
+_STRIP_TABLE = str.maketrans("", "", "\r\n")
+_SPACES_RE = re.compile(r" {2,}")
+
+# Parameter name keywords that suggest a diagnostic parameter (case-insensitive)
+_DIAGNOSTIC_KEYWORDS_RE = re.compile(
+    r"accumulated|total|starts|runtime|hours|alarm|error", re.IGNORECASE
+)
+
+
+def normalize_unit(unit):
+    """Normalize unit of measurement strings.
+
+    Args:
+        unit (str): The unit string to normalize.
+
+    Returns:
+        str: Normalized unit string.
+
+    """
+    return _UNIT_NORMALIZATION.get(unit, unit)
+
+
+def get_unit_to_device_class_mapping():
+    """Get mapping of parameter units to Home Assistant device classes.
+
+    Returns:
+        dict: Dictionary mapping units to device classes.
+
+    """
+    return dict(_UNIT_TO_DEVICE_CLASS)
 
 
 def get_parameter_id_to_device_class_mapping():
@@ -75,11 +170,7 @@ def get_parameter_id_to_device_class_mapping():
         dict: Dictionary mapping parameter IDs to device classes.
 
     """
-    return {
-        "43161": "binary_sensor",  # Electricity add (alarm)
-        "60433": "humidity",  # Relative humidity
-        "installation_date": "date",  # Installation date (virtual parameter)
-    }
+    return dict(_PARAMETER_ID_TO_DEVICE_CLASS)
 
 
 def determine_device_class(parameter_unit, parameter_id):
@@ -94,14 +185,12 @@ def determine_device_class(parameter_unit, parameter_id):
 
     """
     # Check if parameter ID maps to a known device class
-    id_mapping = get_parameter_id_to_device_class_mapping()
-    if parameter_id in id_mapping:
-        return id_mapping[parameter_id]
+    if parameter_id in _PARAMETER_ID_TO_DEVICE_CLASS:
+        return _PARAMETER_ID_TO_DEVICE_CLASS[parameter_id]
 
     # Check if unit maps to a known device class
-    unit_mapping = get_unit_to_device_class_mapping()
-    if parameter_unit in unit_mapping:
-        return unit_mapping[parameter_unit]
+    if parameter_unit in _UNIT_TO_DEVICE_CLASS:
+        return _UNIT_TO_DEVICE_CLASS[parameter_unit]
 
     return None
 
@@ -116,6 +205,10 @@ def determine_value_type(value):
         str: Type description ('bool', 'int', 'float', or 'string').
 
     """
+    # Exact-type lookup covers JSON-decoded values; subclasses fall through
+    value_type = _VALUE_TYPES.get(type(value))
+    if value_type is not None:
+        return value_type
     if isinstance(value, bool):
         return "bool"
     if isinstance(value, int):
@@ -135,8 +228,7 @@ def has_enum_values(parameter_info):
         bool: True if parameter has enumValues, False otherwise.
 
     """
-    enum_values = parameter_info.get("enum_values", [])
-    return bool(enum_values) and len(enum_values) > 0
+    return bool(parameter_info.get("enum_values"))
 
 
 def clean_enum_text(text):
@@ -151,12 +243,9 @@ def clean_enum_text(text):
     """
     if not text:
         return text
-    # Remove newlines, carriage returns, and normalize whitespace
-    cleaned = text.replace("\r", "").replace("\n", "")
-    # Replace multiple spaces with single space
-    while "  " in cleaned:
-        cleaned = cleaned.replace("  ", " ")
-    return cleaned.strip()
+    # Remove newlines and carriage returns, then collapse runs of spaces
+    cleaned = text.translate(_STRIP_TABLE)
+    return _SPACES_RE.sub(" ", cleaned).strip()
 
 
 def build_enum_options(enum_values):
@@ -178,6 +267,9 @@ def build_enum_options(enum_values):
     return options
 
 
+# Parameter IDs and names repeat across devices and polls; the cache holds one
+# entry per distinct parameter
+@lru_cache(maxsize=1024)
 def determine_entity_category(parameter_id, parameter_name):
     """Determine Home Assistant entity category based on parameter.
 
@@ -189,23 +281,13 @@ def determine_entity_category(parameter_id, parameter_name):
         str or None: Entity category ('diagnostic', 'config') or None for regular sensors.
 
     """
-    # Diagnostic parameters - informational only, not for control
-    diagnostic_ids = {
-        "43161",  # Electricity add (alarm)
-        "43437",  # Compressor active accumulated time
-        "43438",  # Compressor starts
-    }
-
     # Check if parameter ID is in diagnostic list
-    if parameter_id in diagnostic_ids:
+    if parameter_id in _DIAGNOSTIC_IDS:
         return "diagnostic"
 
     # Check if parameter name suggests diagnostic nature
-    diagnostic_keywords = ["accumulated", "total", "starts", "runtime", "hours", "alarm", "error"]
-    if parameter_name:
-        param_lower = parameter_name.lower()
-        if any(keyword in param_lower for keyword in diagnostic_keywords):
-            return "diagnostic"
+    if parameter_name and _DIAGNOSTIC_KEYWORDS_RE.search(parameter_name):
+        return "diagnostic"
 
     return None
 
@@ -223,34 +305,35 @@ def clean_parameter_name(parameter_name, device_name):
     """
     # Check if parameter starts with "DeviceName (" and ends with ")"
     prefix = f"{device_name} ("
-    if parameter_name.startswith(prefix):
-        # Find the matching closing parenthesis (handling nested parentheses)
-        # Start counting after the opening parenthesis we know is there
-        paren_count = 1
-        start_idx = len(prefix)
-
-        for i in range(start_idx, len(parameter_name)):
-            if parameter_name[i] == "(":
-                paren_count += 1
-            elif parameter_name[i] == ")":
-                paren_count -= 1
-                if paren_count == 0:
-                    # Found the matching closing parenthesis
-                    if i == len(parameter_name) - 1:
-                        # It's at the end, so extract the content
-                        return parameter_name[start_idx:i]
-                    break
-
-    return parameter_name
-
-
-def _add_enum_configuration(payload, parameter_info, state_topic):
+    if not (parameter_name.startswith(prefix) and parameter_name.endswith(")")):
+        return parameter_name
+
+    inner = parameter_name[len(prefix) : -1]
+
+    # Common case: no nested parentheses, the trailing ")" closes the prefix
+    if "(" not in inner and ")" not in inner:
+        return inner
+
+    # Nested parentheses: the prefix "(" must stay open until the final ")"
+    depth = 0
+    for char in inner:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                return parameter_name
+
+    return inner if depth == 0 else parameter_name
+
+
+def _add_enum_configuration(payload, parameter_info, system_id):
     """Add enum-specific configuration to discovery payload.
 
     Args:
         payload (dict): Discovery payload to modify.
         parameter_info (dict): Parameter information with enum_values.
-        state_topic (str): MQTT state topic.
+        system_id (str): System ID for the command topic, or None to omit it.
 
     """
     enum_values = parameter_info.get("enum_values", [])
@@ -258,27 +341,48 @@ def _add_enum_configuration(payload, parameter_info, state_topic):
     payload["options"] = options
 
     # Add command topic for select entity (allows Home Assistant to send commands)
-    # Extract system_id from state_topic (format: myuplink/{system_id}/{parameter_id}/value)
-    state_topic_parts = state_topic.split("/")
-    if len(state_topic_parts) >= 2:
-        system_id = state_topic_parts[1]
-        command_topic = f"{MQTT_BASE_TOPIC}/{system_id}/{parameter_info['id']}/set"
-        payload["command_topic"] = command_topic
+    if system_id is not None:
+        payload["command_topic"] = f"{MQTT_BASE_TOPIC}/{system_id}/{parameter_info['id']}/set"
 
     # Get current value's text representation
     current_value = parameter_info.get("value")
-    current_text = (
-        str(int(current_value)) if isinstance(current_value, float) else str(current_value)
-    )
+    current_text = str(int(current_value)) if type(current_value) is float else str(current_value)
+
+    # Use a pass-through template if the current value is a known option
+    if any(enum_item.get("value") == current_text for enum_item in enum_values):
+        payload["value_template"] = "{{ value }}"
 
-    # Find the text for current value
-    for enum_item in enum_values:
-        if enum_item.get("value") == current_text:
-            payload["value_template"] = "{{ value }}"
-            break
 
+def build_device_block(device_info):
+    """Build the "device" section of a discovery payload.
 
-def build_discovery_payload(device_info, parameter_info, state_topic, availability_topic):
+    The result is identical for every parameter of a device, so callers that
+    announce many parameters can build it once and share it.
+
+    Args:
+        device_info (dict): Device information with keys: id, manufacturer, model,
+                           serial (optional).
+
+    Returns:
+        dict: Device block for Home Assistant MQTT discovery.
+
+    """
+    device_block = {
+        "identifiers": [f"myuplink_{device_info['id']}"],
+        "manufacturer": device_info["manufacturer"],
+        "model": device_info["model"],
+    }
+
+    # Add serial number if available
+    if device_info.get("serial"):
+        device_block["serial_number"] = device_info["serial"]
+
+    return device_block
+
+
+def build_discovery_payload(
+    device_info, parameter_info, state_topic, availability_topic, device_block=None, system_id=None
+):
     """Build Home Assistant discovery payload.
 
     Args:
@@ -288,6 +392,10 @@ def build_discovery_payload(device_info, parameter_info, state_topic, availabili
                               value_type, category (optional), enum_values (optional).
         state_topic (str): MQTT state topic.
         availability_topic (str): MQTT availability topic.
+        device_block (dict, optional): Prebuilt device block from build_device_block()
+                                       to share between parameters of the same device.
+        system_id (str, optional): System ID used for the enum command topic. Parsed from
+                                   state_topic (myuplink/{system_id}/...) when omitted.
 
     Returns:
         dict: Discovery payload for Home Assistant MQTT integration.
@@ -298,36 +406,27 @@ def build_discovery_payload(device_info, parameter_info, state_topic, availabili
     # Clean the parameter name to remove device name prefix
     clean_name = clean_parameter_name(parameter_info["name"], device_info["name"])
 
+    unique_id = f"myuplink_{device_info['id']}_{parameter_info['id']}"
+
     discovery_payload = {
         "name": clean_name,
-        "default_entity_id": f"myuplink_{device_info['id']}_{parameter_info['id']}",
-        "unique_id": f"myuplink_{device_info['id']}_{parameter_info['id']}",
+        "default_entity_id": unique_id,
+        "unique_id": unique_id,
         "state_topic": state_topic,
         "availability_topic": availability_topic,
-        "availability_mode": "latest",
-        "payload_available": "online",
-        "payload_not_available": "offline",
-        "enabled_by_default": True,
-        "origin": {
-            "name": "myUplink2mqtt",
-            "sw": "1.0.0",
-            "url": "https://github.com/j-b-n/myUplink2mqtt",
-        },
-        "device": {
-            "identifiers": [f"myuplink_{device_info['id']}"],
-            #"name": device_info["name"],
-            "manufacturer": device_info["manufacturer"],
-            "model": device_info["model"],
-        },
+        **_STATIC_FIELDS,
+        # Shared between payloads; Home Assistant only reads it
+        "origin": _ORIGIN,
+        "device": device_block if device_block is not None else build_device_block(device_info),
     }
 
-    # Add serial number if available
-    if device_info.get("serial"):
-        discovery_payload["device"]["serial_number"] = device_info["serial"]
-
     # Check if parameter has enumValues for select entity
-    if has_enum_values(parameter_info):
-        _add_enum_configuration(discovery_payload, parameter_info, state_topic)
+    if parameter_info.get("enum_values"):
+        if system_id is None:
+            state_topic_parts = state_topic.split("/")
+            if len(state_topic_parts) >= 2:
+                system_id = state_topic_parts[1]
+        _add_enum_configuration(discovery_payload, parameter_info, system_id)
     else:
         # Add unit for sensor platforms (not binary sensors or enums)
         value_type = parameter_info.get("value_type", "string")
@@ -350,7 +449,7 @@ def build_discovery_payload(device_info, parameter_info, state_topic, availabili
 
         # Add state class for numeric sensors
         if not is_binary and unit:
-            if unit in ["kWh", "Wh"]:
+            if unit in _TOTAL_INCREASING_UNITS:
                 discovery_payload["state_class"] = "total_increasing"
             else:
                 discovery_payload["state_class"] = "measurement"
@@ -362,8 +461,101 @@ def build_discovery_payload(device_info, parameter_info, state_topic, availabili
     return discovery_payload
 
 
+def _determine_component(parameter_info):
+    """Determine the Home Assistant component type for a parameter.
+
+    Priority: enum > text (for string values without unit) > binary_sensor > sensor.
+
+    Args:
+        parameter_info (dict): Parameter information dictionary.
+
+    Returns:
+        str: Component type ('select', 'text', 'binary_sensor' or 'sensor').
+
+    """
+    if parameter_info.get("enum_values"):
+        return "select"
+
+    value_type = parameter_info.get("value_type", "string")
+    unit = parameter_info.get("unit", "")
+    is_binary = value_type == "bool" or (value_type == "int" and not unit)
+
+    # Use "text" component for string values with no unit (like dates)
+    if value_type == "string" and not unit:
+        return "text"
+    if is_binary:
+        return "binary_sensor"
+    return "sensor"
+
+
+@lru_cache(maxsize=16)
+def _build_topics(base_topic, system_id):
+    """Build the per-system topic parts shared by all of its parameters.
+
+    Args:
+        base_topic (str): MQTT base topic.
+        system_id (str): System ID.
+
+    Returns:
+        _SystemTopics: Parameter topic prefix and availability topic.
+
+    """
+    system_prefix = f"{base_topic}/{system_id}/"
+    return _SystemTopics(system_prefix, system_prefix + "available")
+
+
+def _build_discovery_message(device_info, parameter_info, system_id, prefix, device_block=None):
+    """Build the discovery topic and serialized payload for one parameter.
+
+    Args:
+        device_info (dict): Device information.
+        parameter_info (dict): Parameter information.
+        system_id (str): System ID for topic structure.
+        prefix (str): Home Assistant discovery prefix.
+        device_block (dict, optional): Shared device block for this device.
+
+    Returns:
+        tuple: (discovery_topic, payload_json)
+
+    """
+    component = _determine_component(parameter_info)
+    topics = _build_topics(MQTT_BASE_TOPIC, system_id)
+    parameter_id = str(parameter_info["id"])
+
+    # Create unique object ID
+    unique_id = f"myuplink_{device_info['id']}_{parameter_id}"
+
+    # Discovery topic
+    discovery_topic = f"{prefix}/{component}/{unique_id}/config"
+
+    # State topic
+    state_topic = topics.parameter_prefix + parameter_id + "/value"
+
+    discovery_payload = build_discovery_payload(
+        device_info,
+        parameter_info,
+        state_topic,
+        topics.availability_topic,
+        device_block,
+        system_id,
+    )
+
+    # Add command_topic for text entities (required by HA)
+    if component == "text":
+        discovery_payload["command_topic"] = topics.parameter_prefix + parameter_id + "/set"
+
+    # Compact separators: the payload is only read by Home Assistant
+    payload_json = json.dumps(discovery_payload, separators=(",", ":"))
+
+    # Log the discovery payload for debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Discovery payload for {unique_id}: {payload_json}")
+
+    return discovery_topic, payload_json
+
+
 def publish_ha_discovery(
-    mqtt_client, device_info, parameter_info, system_id, discovery_prefix=None
+    mqtt_client, device_info, parameter_info, system_id, discovery_prefix=None, device_block=None
 ):
     """Publish Home Assistant MQTT discovery configuration.
 
@@ -380,6 +572,8 @@ def publish_ha_discovery(
                               value_type, enum_values (optional).
         system_id (str): System ID for topic structure.
         discovery_prefix (str, optional): Home Assistant discovery prefix (default: from env).
+        device_block (dict, optional): Prebuilt device block from build_device_block()
+                                       to share between parameters of the same device.
 
     Returns:
         bool: True if published successfully, False otherwise.
@@ -387,51 +581,12 @@ def publish_ha_discovery(
     """
     try:
         # Use provided discovery prefix or fall back to environment variable
-        prefix = discovery_prefix if discovery_prefix else HA_DISCOVERY_PREFIX
-
-        # Determine component type
-        # Priority: enum > binary_sensor > text (for string values) > sensor
-        if has_enum_values(parameter_info):
-            component = "select"
-        else:
-            value_type = parameter_info.get("value_type", "string")
-            unit = parameter_info.get("unit", "")
-            is_binary = value_type == "bool" or (value_type == "int" and not unit)
-
-            # Use "text" component for string values with no unit (like dates)
-            if value_type == "string" and not unit:
-                component = "text"
-            elif is_binary:
-                component = "binary_sensor"
-            else:
-                component = "sensor"
-
-        # Create unique object ID
-        unique_id = f"myuplink_{device_info['id']}_{parameter_info['id']}"
-
-        # Discovery topic
-        discovery_topic = f"{prefix}/{component}/{unique_id}/config"
-
-        # State topic
-        state_topic = f"{MQTT_BASE_TOPIC}/{system_id}/{parameter_info['id']}/value"
+        prefix = discovery_prefix or HA_DISCOVERY_PREFIX
 
-        # Availability topic
-        availability_topic = f"{MQTT_BASE_TOPIC}/{system_id}/available"
-
-        # Build and publish discovery payload
-        discovery_payload = build_discovery_payload(
-            device_info, parameter_info, state_topic, availability_topic
+        discovery_topic, payload_json = _build_discovery_message(
+            device_info, parameter_info, system_id, prefix, device_block
         )
-
-        # Add command_topic for text entities (required by HA)
-        if component == "text":
-            command_topic = f"{MQTT_BASE_TOPIC}/{system_id}/{parameter_info['id']}/set"
-            discovery_payload["command_topic"] = command_topic
-
-        # Log the discovery payload for debugging
-        logger.debug(f"Discovery payload for {unique_id}: {json.dumps(discovery_payload)}")
-
-        mqtt_client.publish(discovery_topic, json.dumps(discovery_payload), qos=1, retain=True)
+        mqtt_client.publish(discovery_topic, payload_json, qos=1, retain=True)
         return True
     except Exception as e:  # pylint: disable=broad-exception-caught
         logger.error(f"Failed to publish discovery for {parameter_info.get('id', 'unknown')}: {e}")
@@ -13,10 +13,13 @@ Reference: https://wiki.domoticz.com/Domoticz_API/JSON_URL%27s
 
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,24 @@ logger = logging.getLogger(__name__)
 HTTP_STATUS_OK = 200
 HTTP_STATUS_CREATED = 201
 HTTP_STATUS_NO_CONTENT = 204
+HTTP_STATUS_NOT_MODIFIED = 304
+
+# Connection pool sizing for the shared HTTP session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+
+# Retry policy for transient failures on read requests
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_FORCELIST = (502, 503, 504)
+
+# Request timeouts in seconds: connect fails fast (just over a TCP SYN retry)
+# so the retry policy can take over, reads may take longer
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# Seconds a cached device list stays valid
+DEVICE_CACHE_TTL = 30.0
 
 # Domoticz JSON API endpoints
 DOMOTICZ_API_STATUS = "/json.htm?type=command&param=getStatus"
@@ -47,12 +68,18 @@ DOMOTICZ_API_SWITCH_LIGHT = "/json.htm?type=command&param=switchlight"
 class DomoticzClient:
     """Client for interacting with Domoticz JSON API.
 
+    Requests go through a pooled requests.Session so connections are kept alive
+    between calls. Use the client as a context manager, or call close(), to
+    release them.
+
     Attributes:
         host (str): Domoticz host or IP address.
         port (int): Domoticz port (default 8080).
         use_https (bool): Whether to use HTTPS (default False).
         username (str): Optional HTTP Basic Auth username.
         password (str): Optional HTTP Basic Auth password.
+        cache_ttl (float): Seconds the device list is cached (default 30).
+        timeout (tuple): (connect, read) request timeouts in seconds.
 
     """
 
@@ -63,6 +90,9 @@ class DomoticzClient:
         use_https: bool = False,
         username: Optional[str] = None,
         password: Optional[str] = None,
+        cache_ttl: float = DEVICE_CACHE_TTL,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
     ):
         """Initialize Domoticz client.
 
@@ -72,6 +102,9 @@ class DomoticzClient:
             use_https: Whether to use HTTPS (default False).
             username: Optional HTTP Basic Auth username.
             password: Optional HTTP Basic Auth password.
+            cache_ttl: Seconds the device list is cached (default 30).
+            connect_timeout: Seconds to wait for a connection (default 3.05).
+            read_timeout: Seconds to wait for a response (default 10).
 
         """
         self.host = host
@@ -81,6 +114,32 @@ class DomoticzClient:
         self.password = password
         self.base_url = self._build_base_url()
         self.auth = self._build_auth()
+        self.session = self._build_session()
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_ttl = cache_ttl
+        self._cache = {}
+        self._etags = {}
+        # Lookup indexes derived from the device list they were built from
+        self._indexed_devices = None
+        self._by_name = {}
+        self._mqtt_devices = []
+
+    def __enter__(self):
+        """Enter the runtime context.
+
+        Returns:
+            DomoticzClient: This client.
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the session when leaving the runtime context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        self.session.close()
 
     def _build_base_url(self) -> str:
         """Build base URL for Domoticz API.
@@ -103,8 +162,49 @@ class DomoticzClient:
             return HTTPBasicAuth(self.username, self.password)
         return None
 
+    def _build_session(self) -> requests.Session:
+        """Build a keep-alive HTTP session with connection pooling.
+
+        Read requests are retried with exponential backoff on connection errors
+        and gateway errors. Switch commands are sent only once, since Domoticz
+        may already have acted on a request whose response got lost.
+
+        Returns:
+            requests.Session: Session carrying the client's auth.
+
+        """
+        session = requests.Session()
+        session.auth = self.auth
+
+        retries = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_FORCELIST,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            # Hand the last error response back so its status gets logged
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retries
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        # Longest matching prefix wins, so switch commands bypass the retries
+        no_retry_adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0
+        )
+        session.mount(f"{self.base_url}{DOMOTICZ_API_SWITCH_LIGHT}", no_retry_adapter)
+        return session
+
     def _make_request(
-        self, endpoint: str, method: str = "GET", data: Optional[Dict] = None
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        conditional: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """Make HTTP request to Domoticz API.
 
@@ -112,22 +212,27 @@ class DomoticzClient:
             endpoint: API endpoint path.
             method: HTTP method (GET, POST, etc.).
             data: Optional data dict for POST requests.
+            params: Optional query parameters, URL-encoded and appended to the endpoint.
+            conditional: Send If-None-Match with the endpoint's last ETag and reuse the
+                previous body on 304 Not Modified. Only applies to GET requests.
 
         Returns:
             Optional[Dict]: JSON response or None if error.
 
         """
         url = f"{self.base_url}{endpoint}"
+        conditional = conditional and method.upper() == "GET"
+        previous = self._etags.get(endpoint) if conditional else None
+        headers = {"If-None-Match": previous[0]} if previous else None
 
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, auth=self.auth, timeout=10)
-            elif method.upper() == "POST":
-                response = requests.post(url, json=data, auth=self.auth, timeout=10)
-            else:
-                logger.error(f"Unsupported HTTP method: {method}")
+            response = self._send(method, url, params=params, json=data, headers=headers)
+            if response is None:
                 return None
 
+            if previous and response.status_code == HTTP_STATUS_NOT_MODIFIED:
+                return previous[1]
+
             if response.status_code not in (
                 HTTP_STATUS_OK,
                 HTTP_STATUS_CREATED,
@@ -140,7 +245,11 @@ class DomoticzClient:
             if response.status_code == HTTP_STATUS_NO_CONTENT:
                 return {}
 
-            return response.json()
+            body = response.json()
+            etag = response.headers.get("ETag") if conditional else None
+            if etag:
+                self._etags[endpoint] = (etag, body)
+            return body
 
         except requests.exceptions.ConnectionError as e:
             logger.error(f"Connection error to Domoticz: {e}")
@@ -151,10 +260,84 @@ class DomoticzClient:
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON response from Domoticz: {e}")
             return None
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+        except requests.exceptions.RequestException as e:
+            # Any other transport failure, e.g. too many redirects or a broken response
+            logger.error(
+                f"Request to Domoticz failed: {e}", exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             return None
 
+    def _send(self, method: str, url: str, **kwargs: Any) -> Optional[requests.Response]:
+        """Send one HTTP request through the session.
+
+        Args:
+            method: HTTP method (GET or POST).
+            url: Full request URL.
+            **kwargs: Query parameters, JSON body and headers for the request.
+
+        Returns:
+            Optional[requests.Response]: Response, or None if the method is unsupported.
+
+        """
+        if method.upper() == "GET":
+            return self.session.get(url, timeout=self.timeout, **kwargs)
+        if method.upper() == "POST":
+            return self.session.post(url, timeout=self.timeout, **kwargs)
+        logger.error(f"Unsupported HTTP method: {method}")
+        return None
+
+    def _cached_get(self, endpoint: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Make a GET request, reusing a recent response for the same endpoint.
+
+        Args:
+            endpoint: API endpoint path.
+            ttl: Seconds a cached response stays valid.
+
+        Returns:
+            Optional[Dict]: JSON response or None if error.
+
+        """
+        cached = self._cache.get(endpoint)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+
+        # Revalidate with the server's ETag (if it sends one) to skip unchanged bodies
+        response = self._make_request(endpoint, conditional=True)
+        if response is not None:
+            self._cache[endpoint] = (now, response)
+        return response
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached responses so the next read hits the API."""
+        self._cache.clear()
+
+    def _refresh_indexes(self, devices: List[Dict[str, Any]]) -> None:
+        """Rebuild name and MQTT lookup indexes when the device list changes.
+
+        Args:
+            devices: Device list returned by get_devices().
+
+        """
+        if devices is self._indexed_devices:
+            return
+
+        by_name = {}
+        mqtt_devices = []
+        for device in devices:
+            # Keep the first device for duplicate names, as the linear scan did
+            by_name.setdefault(device.get("Name"), device)
+
+            # Check HardwareName or Description for MQTT indicator
+            hw_name = device.get("HardwareName", "").lower()
+            description = device.get("Description", "").lower()
+            if "mqtt" in hw_name or "mqtt" in description:
+                mqtt_devices.append(device)
+
+        self._by_name = by_name
+        self._mqtt_devices = mqtt_devices
+        self._indexed_devices = devices
+
     def get_status(self) -> Optional[Dict[str, Any]]:
         """Get Domoticz server status.
 
@@ -191,11 +374,14 @@ class DomoticzClient:
     def get_devices(self) -> Optional[List[Dict[str, Any]]]:
         """Get list of all active Domoticz devices.
 
+        The list is cached for cache_ttl seconds, so lookups that follow each
+        other share one API call.
+
         Returns:
             Optional[List]: List of device dicts or None if error.
 
         """
-        response = self._make_request(DOMOTICZ_API_DEVICES)
+        response = self._cached_get(DOMOTICZ_API_DEVICES, self.cache_ttl)
         if response and "result" in response:
             return response["result"]
         logger.warning("No devices found or error retrieving devices")
@@ -232,9 +418,10 @@ class DomoticzClient:
         if not devices:
             return None
 
-        for device in devices:
-            if device.get("Name") == device_name:
-                return device
+        self._refresh_indexes(devices)
+        device = self._by_name.get(device_name)
+        if device is not None:
+            return device
 
         logger.warning(f"Device '{device_name}' not found")
         return None
@@ -253,18 +440,10 @@ class DomoticzClient:
         if not devices:
             return []
 
-        matching = []
-        for device in devices:
-            # Check HardwareName or Description for MQTT indicator
-            hw_name = device.get("HardwareName", "").lower()
-            description = device.get("Description", "").lower()
-
-            if "mqtt" in hw_name or "mqtt" in description:
-                # Check if name matches MQTT ID pattern
-                if mqtt_id in device.get("Name", ""):
-                    matching.append(device)
+        self._refresh_indexes(devices)
 
-        return matching
+        # Check if name matches MQTT ID pattern
+        return [device for device in self._mqtt_devices if mqtt_id in device.get("Name", "")]
 
     def validate_discovery_devices(self, discovery_prefix: str) -> Dict[str, Any]:
         """Validate all MQTT-discovered devices.
@@ -300,29 +479,30 @@ class DomoticzClient:
         unique_ids = set()
 
         for device in devices:
+            # Skip anything that is not an MQTT device before reading other fields
             hw_name = device.get("HardwareName", "")
-            device_name = device.get("Name", "")
-            device_id = device.get("ID", "")
+            if "MQTT" not in hw_name:
+                continue
+            result["mqtt_devices"] += 1
 
-            # Check if it's an MQTT device
-            if "MQTT" in hw_name:
-                result["mqtt_devices"] += 1
-
-                # Check if it was auto-discovered by looking for discovery_prefix in unique_id (ID field)
-                if discovery_prefix in device_id:
-                    result["mqtt_auto_discovery_devices"] += 1
-                    unique_ids.add(device_id)
-                    result["devices"].append(
-                        {
-                            "id": device.get("idx"),
-                            "name": device_name,
-                            "type": device.get("Type"),
-                            "subtype": device.get("SubType"),
-                            "status": device.get("Status"),
-                            "last_update": device.get("LastUpdate"),
-                            "hardware": hw_name,
-                        }
-                    )
+            # Check if it was auto-discovered by looking for discovery_prefix in unique_id (ID field)
+            device_id = device.get("ID", "")
+            if discovery_prefix not in device_id:
+                continue
+            result["mqtt_auto_discovery_devices"] += 1
+            unique_ids.add(device_id)
+
+            result["devices"].append(
+                {
+                    "id": device.get("idx"),
+                    "name": device.get("Name", ""),
+                    "type": device.get("Type"),
+                    "subtype": device.get("SubType"),
+                    "status": device.get("Status"),
+                    "last_update": device.get("LastUpdate"),
+                    "hardware": hw_name,
+                }
+            )
 
         result["unique_auto_discovery_ids"] = len(unique_ids)
         return result
@@ -356,17 +536,15 @@ class DomoticzClient:
             bool: True if successful, False otherwise.
 
         """
-        endpoint = "/json.htm?type=command&param=switchlight"
-        data_dict = {"idx": device_id, "switchcmd": state}
+        params = {"idx": device_id, "switchcmd": state}
 
         if brightness is not None:
-            data_dict["level"] = brightness
-
-        # Convert to query string format for Domoticz
-        params = "&".join(f"{k}={v}" for k, v in data_dict.items())
-        endpoint = f"/json.htm?type=command&param=switchlight&{params}"
+            params["level"] = brightness
 
-        response = self._make_request(endpoint)
+        # Let requests URL-encode the values (states may contain spaces or "&")
+        response = self._make_request(DOMOTICZ_API_SWITCH_LIGHT, params=params)
+        # Device states changed, so cached device lists are stale
+        self.invalidate_cache()
         if response and response.get("status") == "OK":
             logger.info(f"Device {device_id} state set to {state}")
             return True
@@ -422,6 +600,7 @@ def create_domoticz_client(
 
     if not client.verify_connection():
         logger.error(f"Failed to connect to Domoticz at {host}:{port}")
+        client.close()
         return None
 
     logger.info(f"Connected to Domoticz at {host}:{port}")
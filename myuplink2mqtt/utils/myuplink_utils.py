@@ -5,18 +5,30 @@ including OAuth authentication, token management, and device operations.
 Follows the MarshFlattsFarm pattern for token storage.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
-from json import dump, load
+import shutil
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from json import load
 from os import path
+from types import MappingProxyType
+from urllib.parse import urlencode
 
 import aiohttp
 from myuplink import Auth, MyUplinkAPI
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth2Session
+from urllib3.util.retry import Retry
 
 from .auto_discovery_utils import (
+    build_device_block,
     build_discovery_payload,
     determine_entity_category,
     determine_value_type,
@@ -27,10 +39,66 @@ logger = logging.getLogger(__name__)
 
 # HTTP status code for successful requests
 HTTP_STATUS_OK = 200
+HTTP_STATUS_NOT_MODIFIED = 304
+
+# Characters dropped from parameter names: soft hyphen, carriage return, line feed
+_NAME_STRIP_TABLE = str.maketrans("", "", "\u00ad\r\n")
+
+# Runs of two or more spaces in parameter names
+_MULTI_SPACE_RE = re.compile(r" {2,}")
+
+# "SAK (...)" device prefix pattern. The optional backreference drops a repeated
+# device name inside the parentheses, as in "SAK (SAK Operating mode)".
+_DEVICE_PREFIX_RE = re.compile(r"^(\w+)\s*\((?:\1\s+)?(.+)\)$")
+
+# Parameter ID in "Text not found: id[60720], fw[noem-h], lang[en-US]" names
+_TEXT_NOT_FOUND_RE = re.compile(r"Text not found: id\[([^\]]*)\]")
+
+# Names for parameters the API reports as "Text not found"
+_PARAMETER_ID_NAMES = MappingProxyType(
+    {
+        "60720": "Installation year",
+        "60719": "Installation month",
+        "60704": "Installation day",
+    }
+)
+
+# Upper bound on parallel device requests; must not exceed the session's
+# connection pool size so every worker gets a pooled connection
+DEVICE_FETCH_WORKERS = 8
+
+# Connection pool and retry policy for the OAuth session; the pool holds one
+# connection per fetch worker with room to spare
+SESSION_POOL_MAXSIZE = 2 * DEVICE_FETCH_WORKERS
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_FORCELIST = (502, 503, 504)
+
+# Units appended by format_parameter_value, keyed by lowercase name keyword in
+# order of precedence
+_UNIT_KEYWORDS = (("temp", "°C"), ("humid", "rh%"), ("flow", "l/m"))
+
+# Distinct parameter names remembered by the name cleaning caches
+PARAMETER_NAME_CACHE_SIZE = 4096
 
 # myUplink API base URL
 MYUPLINK_API_BASE = "https://api.myuplink.com"
 
+# Shared aiohttp session for myUplink API calls, with its connection pool limits
+# and DNS cache lifetime
+SESSION_CONNECTION_LIMIT = 10
+SESSION_KEEPALIVE_TIMEOUT = 75
+SESSION_DNS_CACHE_TTL = 300
+_SESSION = None
+_SESSION_LOOP = None
+
+# Last ETag and raw body per GET request URL for each OAuth session, for
+# conditional device requests; the oldest entries of a session are dropped
+# once ETAG_CACHE_SIZE is reached
+ETAG_CACHE_SIZE = 256
+_ETAG_CACHES = weakref.WeakKeyDictionary()
+_ETAG_CACHE_LOCK = threading.Lock()
+
 # Token file location (following MarshFlattsFarm pattern)
 HOME_DIR = path.expanduser("~")
 TOKEN_FILENAME = HOME_DIR + "/.myUplink_API_Token.json"
@@ -38,19 +106,69 @@ TOKEN_FILENAME = HOME_DIR + "/.myUplink_API_Token.json"
 # Config file for client credentials
 CONFIG_FILENAME = HOME_DIR + "/.myUplink_API_Config.json"
 
+# Serializes token file writes from concurrent device requests
+_TOKEN_SAVE_LOCK = threading.Lock()
+
 
 def token_saver(token):
     """Save the OAuth token to file when it's refreshed.
 
+    The token is written to a temporary file that then replaces the token file,
+    so a crash mid-write never leaves a truncated token behind.
+
     Args:
         token (dict): The OAuth token dictionary to save.
 
     """
-    with open(TOKEN_FILENAME, "w", encoding="utf-8") as token_file:
-        dump(token, token_file)
+    tmp_filename = TOKEN_FILENAME + ".tmp"
+    with _TOKEN_SAVE_LOCK:
+        try:
+            with open(tmp_filename, "w", encoding="utf-8") as token_file:
+                token_file.write(json.dumps(token))
+                token_file.flush()
+                os.fsync(token_file.fileno())
+            # Keep the permissions of the token being replaced
+            if path.exists(TOKEN_FILENAME):
+                shutil.copymode(TOKEN_FILENAME, tmp_filename)
+            os.replace(tmp_filename, TOKEN_FILENAME)
+        except OSError:
+            if path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
     logger.info("Token refreshed and saved to file")
 
 
+@lru_cache(maxsize=4)
+def _load_json_cached(file_path, mtime_ns, size):
+    """Parse a JSON file, cached per file version.
+
+    Args:
+        file_path (str): Path to the JSON file.
+        mtime_ns (int): File modification time, part of the cache key.
+        size (int): File size, part of the cache key.
+
+    Returns:
+        object: Parsed JSON content. Shared between callers; do not modify.
+
+    """
+    with open(file_path, encoding="utf-8") as json_file:
+        return load(json_file)
+
+
+def _load_json_file(file_path):
+    """Load a JSON file, re-reading it only when it has changed on disk.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        object: Copy of the parsed JSON content.
+
+    """
+    file_stat = os.stat(file_path)
+    return _load_json_cached(file_path, file_stat.st_mtime_ns, file_stat.st_size).copy()
+
+
 def load_config():
     """Load client configuration from file or environment variables.
 
@@ -67,8 +185,7 @@ def load_config():
     # Try to load from config file first
     if path.exists(CONFIG_FILENAME):
         try:
-            with open(CONFIG_FILENAME, encoding="utf-8") as config_file:
-                config = load(config_file)
+            config = _load_json_file(CONFIG_FILENAME)
         except (OSError, json.JSONDecodeError) as e:
             logger.error(f"Could not parse config file {CONFIG_FILENAME}: {e}")
             return None, None
@@ -117,25 +234,67 @@ def check_oauth_prerequisites():
     return True, None
 
 
-async def test_api_availability():
+async def get_session():
+    """Return the shared aiohttp session, creating it on first use.
+
+    The session keeps connections to the myUplink API alive between calls. A new
+    one is created if the previous session was closed or belongs to another
+    event loop, e.g. after a second asyncio.run(); the old session is closed.
+
+    Returns:
+        aiohttp.ClientSession: The shared client session.
+
+    """
+    global _SESSION, _SESSION_LOOP  # pylint: disable=global-statement
+    loop = asyncio.get_running_loop()
+    if _SESSION is None or _SESSION.closed or _SESSION_LOOP is not loop:
+        if _SESSION is not None and not _SESSION.closed:
+            await _SESSION.close()
+        connector = aiohttp.TCPConnector(
+            limit=SESSION_CONNECTION_LIMIT,
+            keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+        )
+        _SESSION = aiohttp.ClientSession(connector=connector)
+        _SESSION_LOOP = loop
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared aiohttp session, if one is open."""
+    global _SESSION, _SESSION_LOOP  # pylint: disable=global-statement
+    session = _SESSION
+    _SESSION = None
+    _SESSION_LOOP = None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def test_api_availability(session=None):
     """Test API availability by pinging the myUplink API.
 
+    Args:
+        session (aiohttp.ClientSession, optional): Session to use. Defaults to the
+            shared session from get_session().
+
     Returns:
         bool: True if API is available and responding, False otherwise.
 
     """
-    async with aiohttp.ClientSession() as session:
-        # For ping, we don't need authentication
-        auth = Auth(session, MYUPLINK_API_BASE, "")
-        api = MyUplinkAPI(auth)
+    if session is None:
+        session = await get_session()
 
-        try:
-            ping_result = await api.async_ping()
-            logger.debug(f"API Ping successful: {ping_result}")
-            return ping_result
-        except (OSError, aiohttp.ClientError) as e:
-            logger.error(f"API Ping failed: {e}")
-            return False
+    # For ping, we don't need authentication
+    auth = Auth(session, MYUPLINK_API_BASE, "")
+    api = MyUplinkAPI(auth)
+
+    try:
+        ping_result = await api.async_ping()
+        logger.debug(f"API Ping successful: {ping_result}")
+        return ping_result
+    except (OSError, aiohttp.ClientError) as e:
+        logger.error(f"API Ping failed: {e}")
+        return False
 
 
 def load_oauth_token():
@@ -152,9 +311,64 @@ def load_oauth_token():
     if not path.exists(TOKEN_FILENAME):
         raise FileNotFoundError(f"Token file not found: {TOKEN_FILENAME}")
 
-    with open(TOKEN_FILENAME, encoding="utf-8") as token_file:
-        token = load(token_file)
-    return token
+    return _load_json_file(TOKEN_FILENAME)
+
+
+def _token_already_saved(token):
+    """Accept a token that _OAuth2Session.refresh_token has already saved.
+
+    Args:
+        token (dict): OAuth2 token dictionary.
+
+    """
+
+
+class _OAuth2Session(OAuth2Session):
+    """OAuth2Session that refreshes an expired token only once across threads.
+
+    Device requests share one session from a thread pool. Without the lock every
+    thread that finds the token expired would post its own refresh request.
+    OAuth2Session.request also calls token_updater in each of those threads, so
+    the updater is called from refresh_token instead, only after a real refresh.
+    """
+
+    def __init__(self, *args, token_updater=None, **kwargs):
+        """Initialize the session and its refresh lock.
+
+        Args:
+            *args: Positional arguments for OAuth2Session.
+            token_updater (callable, optional): Called with each refreshed token.
+            **kwargs: Keyword arguments for OAuth2Session.
+
+        """
+        super().__init__(
+            *args, token_updater=_token_already_saved if token_updater else None, **kwargs
+        )
+        self._save_token = token_updater
+        self._refresh_lock = threading.Lock()
+
+    def refresh_token(self, token_url, refresh_token=None, **kwargs):
+        """Refresh and save the token unless another thread already did.
+
+        Args:
+            token_url (str): Token endpoint URL.
+            refresh_token (str, optional): Refresh token to use. Passing one always
+                                           forces a refresh.
+            **kwargs: Extra arguments for OAuth2Session.refresh_token.
+
+        Returns:
+            dict: The current, refreshed token.
+
+        """
+        with self._refresh_lock:
+            # The token may have been refreshed while this thread waited
+            expires_at = self.token.get("expires_at")
+            if refresh_token is None and expires_at and expires_at > time.time():
+                return self.token
+            token = super().refresh_token(token_url, refresh_token=refresh_token, **kwargs)
+            if self._save_token:
+                self._save_token(token)
+            return token
 
 
 def create_oauth_session():
@@ -181,7 +395,7 @@ def create_oauth_session():
     extra_args = {"client_id": client_id, "client_secret": client_secret}
 
     # Instantiate an OAuth2Session object that will automatically refresh tokens
-    myuplink = OAuth2Session(
+    myuplink = _OAuth2Session(
         client_id=client_id,
         token=token,
         auto_refresh_url=token_url,
@@ -189,6 +403,18 @@ def create_oauth_session():
         token_updater=token_saver,
     )
 
+    # Keep-alive pool sized for concurrent device fetches. Read requests are
+    # retried on transient gateway errors; token refresh POSTs are not.
+    retries = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    myuplink.mount("https://", HTTPAdapter(pool_maxsize=SESSION_POOL_MAXSIZE, max_retries=retries))
+
     return myuplink
 
 
@@ -205,29 +431,35 @@ def get_device_brands(myuplink, devices):
         list: List of brand strings (e.g., ["Nibe F1155", "IVT GEO"]).
 
     """
+    device_ids = [device_info["id"] for device_info in devices]
+
+    def fetch_device(device_id):
+        # Return errors instead of raising so each device is reported in order
+        try:
+            return myuplink.get(f"{MYUPLINK_API_BASE}/v2/devices/{device_id}")
+        except (OSError, ValueError, KeyError) as e:
+            return e
+
+    # Get detailed device information, overlapping the API round-trips
+    if len(device_ids) > 1:
+        with ThreadPoolExecutor(max_workers=min(DEVICE_FETCH_WORKERS, len(device_ids))) as pool:
+            responses = list(pool.map(fetch_device, device_ids))
+    else:
+        responses = [fetch_device(device_id) for device_id in device_ids]
+
     brands = []
-    for device_info in devices:
-        device_id = device_info["id"]
+    for device_id, device_response in zip(device_ids, responses):
+        if isinstance(device_response, Exception):
+            brands.append(f"Device {device_id} (error: {device_response!s})")
+            continue
         try:
-            # Get detailed device information
-            device_response = myuplink.get(f"{MYUPLINK_API_BASE}/v2/devices/{device_id}")
             if device_response.status_code != HTTP_STATUS_OK:
                 brands.append(f"Device {device_id} (API error)")
                 continue
 
+            # The brand is the product name, e.g. "Nibe F1155" or "Jäspi Tehowatti Air"
             device_data = device_response.json()
-            product_name = device_data["product"]["name"]
-
-            # Extract manufacturer from product name (simple approach)
-            # Most myUplink devices follow patterns like "Nibe F1155"
-            # or "Jäspi Tehowatti Air"
-            if " " in product_name:
-                parts = product_name.split(" ", 1)
-                manufacturer = parts[0]
-                model = parts[1]
-                brands.append(f"{manufacturer} {model}")
-            else:
-                brands.append(product_name)
+            brands.append(device_data["product"]["name"])
 
         except (OSError, ValueError, KeyError) as e:
             brands.append(f"Device {device_id} (error: {e!s})")
@@ -249,18 +481,9 @@ def get_manufacturer(device_details):
         if not device_details or "product" not in device_details:
             return "Unknown"
 
-        product_name = device_details["product"]["name"]
-
-        # Extract manufacturer from product name (simple approach)
-        # Most myUplink devices follow patterns like "Nibe F1155"
-        # or "Jäspi Tehowatti Air"
-        if " " in product_name:
-            manufacturer = product_name.split(" ", 1)[0]
-            return manufacturer
+        return split_product_name(device_details["product"]["name"])[0]
 
-        return product_name
-
-    except (KeyError, TypeError):
+    except (AttributeError, KeyError, TypeError):
         return "Unknown"
 
 
@@ -290,6 +513,45 @@ def get_systems(myuplink):
         return None
 
 
+def _conditional_get(myuplink, url):
+    """Send a GET request revalidated against the last ETag seen for it.
+
+    When the API answers 304 Not Modified, the body stored with the ETag is
+    parsed again, so every caller gets its own copy.
+
+    Args:
+        myuplink (OAuth2Session): Authenticated OAuth2 session.
+        url (str): Request URL, including any query string.
+
+    Returns:
+        tuple: (HTTP status code, parsed JSON body or None).
+
+    """
+    with _ETAG_CACHE_LOCK:
+        # ETags are only valid for the session (and account) that fetched them
+        cache = _ETAG_CACHES.setdefault(myuplink, {})
+        previous = cache.get(url)
+    headers = {"If-None-Match": previous[0]} if previous else None
+
+    response = myuplink.get(url, headers=headers)
+
+    if previous and response.status_code == HTTP_STATUS_NOT_MODIFIED:
+        return HTTP_STATUS_OK, json.loads(previous[1])
+
+    if response.status_code != HTTP_STATUS_OK:
+        return response.status_code, None
+
+    body = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        with _ETAG_CACHE_LOCK:
+            cache.pop(url, None)
+            if len(cache) >= ETAG_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[url] = (etag, response.content)
+    return HTTP_STATUS_OK, body
+
+
 def get_device_details(myuplink, device_id):
     """Retrieve detailed information for a specific device.
 
@@ -302,13 +564,14 @@ def get_device_details(myuplink, device_id):
 
     """
     try:
-        response = myuplink.get(f"{MYUPLINK_API_BASE}/v2/devices/{device_id}")
+        url = f"{MYUPLINK_API_BASE}/v2/devices/{device_id}"
+        status_code, details = _conditional_get(myuplink, url)
 
-        if response.status_code != HTTP_STATUS_OK:
-            logger.error(f"Failed to get device details. HTTP Status: {response.status_code}")
+        if status_code != HTTP_STATUS_OK:
+            logger.error(f"Failed to get device details. HTTP Status: {status_code}")
             return None
 
-        return response.json()
+        return details
 
     except (OSError, ValueError, KeyError) as e:
         logger.error(f"Error retrieving device details for {device_id}: {e}")
@@ -332,28 +595,58 @@ def get_device_points(myuplink, device_id, parameters=None, language="en-US"):
     try:
         url = f"{MYUPLINK_API_BASE}/v2/devices/{device_id}/points"
 
-        query_params = []
-        if parameters:
-            query_params.append(f"parameters={','.join(parameters)}")
-        if language:
-            query_params.append(f"language={language}")
-
-        if query_params:
-            url += "?" + "&".join(query_params)
+        # Build the query string into the URL: the OAuth session forwards request
+        # keyword arguments such as params to the token refresh request
+        query_params = {
+            "parameters": ",".join(parameters) if parameters else None,
+            "language": language or None,
+        }
+        query = urlencode(
+            {key: value for key, value in query_params.items() if value is not None}, safe=","
+        )
+        if query:
+            url += "?" + query
 
-        response = myuplink.get(url)
+        status_code, points = _conditional_get(myuplink, url)
 
-        if response.status_code != HTTP_STATUS_OK:
-            logger.error(f"Failed to get device points. HTTP Status: {response.status_code}")
+        if status_code != HTTP_STATUS_OK:
+            logger.error(f"Failed to get device points. HTTP Status: {status_code}")
             return None
 
-        return response.json()
+        return points
 
     except (OSError, ValueError, KeyError) as e:
         logger.error(f"Error retrieving device points for {device_id}: {e}")
         return None
 
 
+def get_devices_data(myuplink, device_ids):
+    """Retrieve details and data points for several devices concurrently.
+
+    Each device's requests run on a small thread pool so the API round-trips of
+    different devices overlap.
+
+    Args:
+        myuplink (OAuth2Session): Authenticated OAuth2 session.
+        device_ids (list): The device IDs.
+
+    Returns:
+        list: (device_details, points_data) tuples in device_ids order. Either item
+              is None if its request failed.
+
+    """
+
+    def fetch_device_data(device_id):
+        return get_device_details(myuplink, device_id), get_device_points(myuplink, device_id)
+
+    if len(device_ids) <= 1:
+        return [fetch_device_data(device_id) for device_id in device_ids]
+
+    with ThreadPoolExecutor(max_workers=min(DEVICE_FETCH_WORKERS, len(device_ids))) as pool:
+        return list(pool.map(fetch_device_data, device_ids))
+
+
+@lru_cache(maxsize=PARAMETER_NAME_CACHE_SIZE)
 def clean_parameter_name(parameter_name):
     """Clean parameter name by removing soft hyphens and trimming whitespace.
 
@@ -370,20 +663,32 @@ def clean_parameter_name(parameter_name):
     if not parameter_name:
         return parameter_name
 
-    # Remove soft hyphens (Unicode \u00ad)
-    cleaned = parameter_name.replace("\u00ad", "")
+    # Remove soft hyphens (Unicode \u00ad), carriage returns and line feeds in one pass
+    cleaned = parameter_name.translate(_NAME_STRIP_TABLE)
+
+    # Replace multiple consecutive spaces with a single space, then trim
+    return _MULTI_SPACE_RE.sub(" ", cleaned).strip()
+
 
-    # Remove carriage returns and line feeds
-    cleaned = cleaned.replace("\r", "").replace("\n", "")
+@lru_cache(maxsize=PARAMETER_NAME_CACHE_SIZE)
+def _value_unit(parameter_name):
+    """Return the unit implied by a parameter name.
 
-    # Replace multiple consecutive spaces with a single space
-    while "  " in cleaned:
-        cleaned = cleaned.replace("  ", " ")
+    Args:
+        parameter_name (str): Parameter or display name.
 
-    # Trim leading/trailing whitespace
-    cleaned = cleaned.strip()
+    Returns:
+        str: Unit to append to the value, or None if the name implies none.
 
-    return cleaned
+    """
+    # "BT" sensors are temperatures
+    if "BT" in parameter_name:
+        return "°C"
+    name_lower = parameter_name.lower()
+    for keyword, unit in _UNIT_KEYWORDS:
+        if keyword in name_lower:
+            return unit
+    return None
 
 
 def format_parameter_value(point, display_name=None):
@@ -402,12 +707,9 @@ def format_parameter_value(point, display_name=None):
     parameter_name = display_name if display_name is not None else point["parameterName"]
 
     # Add units based on parameter name patterns
-    if "temp" in parameter_name.lower() or "BT" in parameter_name:
-        return f"{value} °C"
-    if "humid" in parameter_name.lower():
-        return f"{value} rh%"
-    if "flow" in parameter_name.lower():
-        return f"{value} l/m"
+    unit = _value_unit(parameter_name)
+    if unit is not None:
+        return f"{value} {unit}"
 
     # Format installation date values as integers (no decimals)
     if "Installation" in parameter_name:
@@ -428,50 +730,40 @@ def get_parameter_display_name(point):
         str: Display name for the parameter.
 
     """
-    parameter_name = point["parameterName"]
+    return _display_name(point["parameterName"])
+
+
+@lru_cache(maxsize=PARAMETER_NAME_CACHE_SIZE)
+def _display_name(parameter_name):
+    """Build the display name for a raw API parameter name.
+
+    Cached, since the same names come back for every device on every poll.
+
+    Args:
+        parameter_name (str): Parameter name as returned by the API.
+
+    Returns:
+        str: Display name for the parameter.
 
+    """
     # Clean up soft hyphens and trim whitespace using the utility function
     parameter_name = clean_parameter_name(parameter_name)
 
     # Clean up device name prefix pattern like "SAK (..." -> extract content in parens
     # Pattern: "WORD (" where WORD is 1+ word characters
-    # This handles both "SAK (SAK Operating mode)" and "SAK (Ratio hot water [...])"
-    match = re.match(r"^(\w+)\s*\((.+)\)$", parameter_name)
+    # This handles both "SAK (SAK Operating mode)" and "SAK (Ratio hot water [...])",
+    # and a repeated device name is dropped: "SAK (SAK Operating mode)" -> "Operating mode"
+    match = _DEVICE_PREFIX_RE.match(parameter_name)
     if match:
-        # Extract the content inside parentheses
-        inner_content = match.group(2)
-
-        # Check if inner content starts with the same device name pattern
-        # e.g., "SAK (SAK Operating mode)" -> extract just "Operating mode"
-        device_name = match.group(1)
-        inner_pattern = re.match(r"^" + re.escape(device_name) + r"\s+(.+)$", inner_content)
-        if inner_pattern:
-            # Device name is repeated, extract content after it
-            parameter_name = inner_pattern.group(1)
-        else:
-            # Device name is not repeated, use content as-is
-            parameter_name = inner_content
+        parameter_name = match.group(2)
+
     # Extract parameter ID from "Text not found: id[XXXXX]" format
-    parameter_id = ""
-    if parameter_name.startswith("Text not found: id["):
-        try:
-            # Extract ID from format: "Text not found: id[60720], fw[noem-h], lang[en-US]"
-            id_start = parameter_name.find("id[") + 3
-            id_end = parameter_name.find("]", id_start)
-            parameter_id = parameter_name[id_start:id_end]
-        except (ValueError, IndexError):
-            parameter_id = ""
-
-    # Map known parameter IDs to proper names
-    parameter_id_mapping = {
-        "60720": "Installation year",
-        "60719": "Installation month",
-        "60704": "Installation day",
-    }
+    id_match = _TEXT_NOT_FOUND_RE.match(parameter_name)
+    parameter_id = id_match.group(1) if id_match else ""
 
     # If we found a parameter ID and have a mapping, use it
-    if parameter_id and parameter_id in parameter_id_mapping:
-        return parameter_id_mapping[parameter_id]
+    if parameter_id in _PARAMETER_ID_NAMES:
+        return _PARAMETER_ID_NAMES[parameter_id]
 
     # For unmapped "Text not found" parameters, show "No Label (<ID>)"
     if parameter_id:
@@ -480,6 +772,23 @@ def get_parameter_display_name(point):
     return parameter_name
 
 
+def split_product_name(product_name):
+    """Split a product name into manufacturer and model in one pass.
+
+    Args:
+        product_name (str): Full product name, e.g. "NIBE F2120".
+
+    Returns:
+        tuple: (manufacturer, model). Without a space the manufacturer is "Unknown"
+               and the model is the full product name.
+
+    """
+    manufacturer, separator, model = product_name.partition(" ")
+    if not separator:
+        return "Unknown", product_name
+    return manufacturer, model
+
+
 def extract_manufacturer(product_name):
     """Extract manufacturer name from product name.
 
@@ -490,7 +799,7 @@ def extract_manufacturer(product_name):
         str: Manufacturer name or "Unknown" if not found.
 
     """
-    return product_name.split(" ", 1)[0] if " " in product_name else "Unknown"
+    return split_product_name(product_name)[0]
 
 
 def extract_model(product_name):
@@ -503,7 +812,7 @@ def extract_model(product_name):
         str: Model name or full product name if no space found.
 
     """
-    return product_name.split(" ", 1)[1] if " " in product_name else product_name
+    return split_product_name(product_name)[1]
 
 
 def add_auto_discovery_to_points(points_data, device_info, system_id):
@@ -518,6 +827,11 @@ def add_auto_discovery_to_points(points_data, device_info, system_id):
         None: Modifies points_data in place.
 
     """
+    # All points belong to the same device, so they can share one device block
+    # and availability topic
+    device_block = build_device_block(device_info)
+    availability_topic = f"myuplink/{system_id}/available"
+
     for point in points_data:
         parameter_info = {
             "id": point["parameterId"],
@@ -533,11 +847,15 @@ def add_auto_discovery_to_points(points_data, device_info, system_id):
 
         # Generate discovery payload
         state_topic = f"myuplink/{system_id}/{point['parameterId']}/value"
-        availability_topic = f"myuplink/{system_id}/available"
 
         try:
             discovery_payload = build_discovery_payload(
-                device_info, parameter_info, state_topic, availability_topic
+                device_info,
+                parameter_info,
+                state_topic,
+                availability_topic,
+                device_block,
+                system_id,
             )
             point["autoDiscovery"] = discovery_payload
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -545,6 +863,80 @@ def add_auto_discovery_to_points(points_data, device_info, system_id):
             point["autoDiscovery"] = None
 
 
+def _build_system_data(system, devices_data):
+    """Build the export structure for one system.
+
+    Args:
+        system (dict): System entry from the systems endpoint.
+        devices_data (dict): (details, points) tuples keyed by device ID.
+
+    Returns:
+        dict: System data with its devices and data points.
+
+    """
+    system_id = system["systemId"]
+    system_name = system["name"]
+    logger.info(f"Processing system: {system_name} (ID: {system_id})")
+
+    system_data = {
+        "systemId": system_id,
+        "name": system_name,
+        "devices": [],
+    }
+
+    # Process each device in the system
+    for device in system["devices"]:
+        device_id = device["id"]
+        device_details, points_data = devices_data[device_id]
+
+        if device_details is None:
+            logger.warning(f"Could not retrieve device details for {device_id}")
+            continue
+
+        product = device_details.get("product") or {}
+        product_name = product.get("name", "")
+        logger.info(f"Processing device: {product_name} ({device_id})")
+
+        if points_data is None:
+            logger.warning(f"Could not retrieve data points for {device_id}")
+            continue
+
+        logger.info(f"Retrieved {len(points_data)} data points")
+
+        # Clean parameter names in all data points
+        for point in points_data:
+            if "parameterName" in point:
+                point["parameterName"] = clean_parameter_name(point["parameterName"])
+
+        # Generate auto discovery information for each data point
+        # Prepare device info for discovery payload
+        manufacturer, model = split_product_name(product_name)
+        device_info = {
+            "id": device_id,
+            "name": product_name or "Unknown",
+            "manufacturer": manufacturer,
+            "model": model,
+            "serial": device_details.get("serialNumber", ""),
+        }
+
+        # Add auto discovery payloads to each data point
+        add_auto_discovery_to_points(points_data, device_info, system_id)
+
+        # Build device data structure
+        device_data = {
+            "id": device_id,
+            "product": product,
+            "serialNumber": device_details.get("serialNumber", ""),
+            "connectionState": device_details.get("connectionState", ""),
+            "currentFwVersion": device_details.get("currentFwVersion", ""),
+            "dataPoints": points_data,
+        }
+
+        system_data["devices"].append(device_data)
+
+    return system_data
+
+
 def save_api_data_to_file(myuplink, filename):
     """Save all myUplink API data to a JSON file.
 
@@ -569,80 +961,23 @@ def save_api_data_to_file(myuplink, filename):
 
     logger.info(f"Retrieved {len(systems)} system(s)")
 
-    # Build complete data structure
-    data = {"systems": []}
-
-    for system in systems:
-        system_id = system["systemId"]
-        system_name = system["name"]
-        logger.info(f"Processing system: {system_name} (ID: {system_id})")
-
-        system_data = {
-            "systemId": system_id,
-            "name": system_name,
-            "devices": [],
-        }
-
-        # Process each device in the system
-        for device in system["devices"]:
-            device_id = device["id"]
-
-            # Get device details
-            device_details = get_device_details(myuplink, device_id)
-            if device_details is None:
-                logger.warning(f"Could not retrieve device details for {device_id}")
-                continue
+    # Fetch every device of every system concurrently up front
+    device_ids = [device["id"] for system in systems for device in system["devices"]]
+    devices_data = dict(zip(device_ids, get_devices_data(myuplink, device_ids)))
 
-            logger.info(f"Processing device: {device_details['product']['name']} ({device_id})")
-
-            # Get all data points
-            points_data = get_device_points(myuplink, device_id)
-            if points_data is None:
-                logger.warning(f"Could not retrieve data points for {device_id}")
-                continue
+    data = {"systems": [_build_system_data(system, devices_data) for system in systems]}
 
-            logger.info(f"Retrieved {len(points_data)} data points")
-
-            # Clean parameter names in all data points
-            for point in points_data:
-                if "parameterName" in point:
-                    point["parameterName"] = clean_parameter_name(point["parameterName"])
-
-            # Generate auto discovery information for each data point
-            # Prepare device info for discovery payload
-            device_info = {
-                "id": device_id,
-                "name": device_details.get("product", {}).get("name", "Unknown"),
-                "manufacturer": extract_manufacturer(
-                    device_details.get("product", {}).get("name", "")
-                ),
-                "model": extract_model(device_details.get("product", {}).get("name", "")),
-                "serial": device_details.get("serialNumber", ""),
-            }
-
-            # Add auto discovery payloads to each data point
-            add_auto_discovery_to_points(points_data, device_info, system_id)
-
-            # Build device data structure
-            device_data = {
-                "id": device_id,
-                "product": device_details.get("product", {}),
-                "serialNumber": device_details.get("serialNumber", ""),
-                "connectionState": device_details.get("connectionState", ""),
-                "currentFwVersion": device_details.get("currentFwVersion", ""),
-                "dataPoints": points_data,
-            }
-
-            system_data["devices"].append(device_data)
-
-        data["systems"].append(system_data)
-
-    # Save to file
+    # Write to a temporary file first so a failed write keeps the old export intact
+    tmp_filename = filename + ".tmp"
     try:
-        with open(filename, "w", encoding="utf-8") as f:
+        with open(tmp_filename, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_filename, filename)
         logger.info(f"Successfully saved API data to {filename}")
         return True
     except OSError as e:
         logger.error(f"Failed to write to file {filename}: {e}")
         return False
+    finally:
+        if path.exists(tmp_filename):
+            os.remove(tmp_filename)
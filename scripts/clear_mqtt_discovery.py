@@ -12,7 +12,6 @@ Uses the same configuration pattern as the main myUplink2mqtt project.
 import os
 import sys
 import time
-from collections import defaultdict
 from pathlib import Path
 
 import paho.mqtt.client as mqtt
@@ -41,8 +40,8 @@ HA_DISCOVERY_PREFIX = os.getenv("HA_DISCOVERY_PREFIX", "homeassistant")
 # HTTP status code for successful requests
 HTTP_STATUS_OK = 200
 
-# Global storage for discovered topics
-DISCOVERED_TOPICS = defaultdict(list)
+# Global storage for discovered topics; a set so retained duplicates collapse on arrival
+DISCOVERED_TOPICS = set()
 DISCOVERY_COMPLETE = False
 
 
@@ -50,10 +49,9 @@ def on_message(client, userdata, message):
     """Store topic for clearing when a message is received."""
     _ = (client, userdata)  # Unused
     topic = message.topic
-    # Store topics that match our patterns
+    # Store topics that match our patterns; they are counted once the scan ends
     if "myuplink" in topic.lower():
-        DISCOVERED_TOPICS["all"].append(topic)
-        print(f"  Found topic: {topic}")
+        DISCOVERED_TOPICS.add(topic)
 
 
 def on_subscribe(client, userdata, mid, reason_code_list, properties):
@@ -110,7 +108,7 @@ def scan_for_existing_topics(mqtt_client):
     print("Waiting 3 seconds for topic discovery...")
     time.sleep(3)
 
-    topics = list(set(DISCOVERED_TOPICS["all"]))  # Remove duplicates
+    topics = list(DISCOVERED_TOPICS)
     print(f"Found {len(topics)} existing topics")
     return topics
 
@@ -158,8 +156,6 @@ def clear_device_discovery(mqtt_client, myuplink, system_id, device_id):
             cleared += 1
             print(f"  Cleared value: {value_topic}")
 
-        time.sleep(0.01)
-
     return cleared
 
 
@@ -194,7 +190,6 @@ def main():
         if mqtt_client.publish(topic, "", retain=True).rc == 0:
             total_cleared += 1
             print(f"  Cleared: {topic}")
-        time.sleep(0.01)
 
     # Then clear topics for current devices/parameters
     print("\nClearing current device topics...")
@@ -213,7 +208,7 @@ def main():
         print(f"  Cleared availability: {availability_topic}")
         total_cleared += 1
 
-    # Cleanup
+    # Give the network loop a moment to flush the queued publishes, then clean up
     time.sleep(1)
     mqtt_client.loop_stop()
     mqtt_client.disconnect()
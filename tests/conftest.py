@@ -6,220 +6,266 @@ with realistic API responses and MQTT server behavior.
 
 import json
 import os
+from collections import defaultdict
+from types import MappingProxyType
 from unittest.mock import MagicMock, Mock, patch
+from urllib.parse import urlsplit
 
 import pytest
 
 # ============================================================================
 # Mock myUplink API Response Data
 # ============================================================================
+# The response data fixtures are session scoped and return read-only views:
+# every test shares the same objects, so a test that needs to change one must
+# copy.deepcopy() it first.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_oauth_token():
     """Return mock OAuth token data.
 
     Returns:
-        dict: Mock OAuth token matching myUplink API format.
+        MappingProxyType: Read-only mock OAuth token matching myUplink API format.
     """
-    return {
-        "access_token": "mock_access_token_12345",
-        "token_type": "Bearer",
-        "expires_in": 3600,
-        "refresh_token": "mock_refresh_token_12345",
-        "scope": "READSYSTEM",
-        "expires_at": 1234567890.0,
-    }
-
-
-@pytest.fixture
+    return MappingProxyType(
+        {
+            "access_token": "mock_access_token_12345",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "refresh_token": "mock_refresh_token_12345",
+            "scope": "READSYSTEM",
+            "expires_at": 1234567890.0,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_config():
     """Return mock OAuth configuration.
 
     Returns:
-        dict: Mock client credentials.
+        MappingProxyType: Read-only mock client credentials.
     """
-    return {"client_id": "test_client_id_12345", "client_secret": "test_client_secret_abcde"}
+    return MappingProxyType(
+        {"client_id": "test_client_id_12345", "client_secret": "test_client_secret_abcde"}
+    )
 
 
-@pytest.fixture
-def temp_config_files(tmp_path, mock_oauth_token, mock_config):
-    """Create temporary config and token files for testing.
+@pytest.fixture(scope="session")
+def config_files_json(mock_config, mock_oauth_token):
+    """Return the config and token file contents, serialized once per session.
 
     Args:
-        tmp_path: pytest's temporary directory fixture.
-        mock_oauth_token: Mock token data fixture.
         mock_config: Mock config data fixture.
+        mock_oauth_token: Mock token data fixture.
 
-    Yields:
-        tuple: (config_file_path, token_file_path)
+    Returns:
+        tuple: (config_json, token_json)
     """
-    config_file = tmp_path / "config.json"
-    token_file = tmp_path / "token.json"
-
-    config_file.write_text(json.dumps(mock_config))
-    token_file.write_text(json.dumps(mock_oauth_token))
+    return json.dumps(dict(mock_config)), json.dumps(dict(mock_oauth_token))
 
-    yield str(config_file), str(token_file)
 
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_systems_response():
     """Return mock response for /v2/systems/me API endpoint.
 
     Returns:
-        dict: Mock systems data with devices.
+        MappingProxyType: Read-only mock systems data with devices.
     """
-    return {
-        "systems": [
-            {
-                "systemId": "system-123",
-                "name": "My Home System",
-                "devices": [
-                    {
-                        "id": "device-001",
-                        "deviceType": "HEAT_PUMP",
-                        "connectionStatus": "ONLINE",
-                        "activationDate": "2023-01-15",
-                    },
-                    {
-                        "id": "device-002",
-                        "deviceType": "INDOOR_UNIT",
-                        "connectionStatus": "ONLINE",
-                        "activationDate": "2023-01-15",
-                    },
-                ],
-            },
-            {
-                "systemId": "system-456",
-                "name": "Cabin System",
-                "devices": [
-                    {
-                        "id": "device-003",
-                        "deviceType": "HEAT_PUMP",
-                        "connectionStatus": "OFFLINE",
-                        "activationDate": "2023-06-01",
-                    }
-                ],
-            },
-        ]
-    }
-
-
-@pytest.fixture
+    return MappingProxyType(
+        {
+            "systems": [
+                {
+                    "systemId": "system-123",
+                    "name": "My Home System",
+                    "devices": [
+                        {
+                            "id": "device-001",
+                            "deviceType": "HEAT_PUMP",
+                            "connectionStatus": "ONLINE",
+                            "activationDate": "2023-01-15",
+                        },
+                        {
+                            "id": "device-002",
+                            "deviceType": "INDOOR_UNIT",
+                            "connectionStatus": "ONLINE",
+                            "activationDate": "2023-01-15",
+                        },
+                    ],
+                },
+                {
+                    "systemId": "system-456",
+                    "name": "Cabin System",
+                    "devices": [
+                        {
+                            "id": "device-003",
+                            "deviceType": "HEAT_PUMP",
+                            "connectionStatus": "OFFLINE",
+                            "activationDate": "2023-06-01",
+                        }
+                    ],
+                },
+            ]
+        }
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_device_details_nibe():
     """Return mock device details for a Nibe heat pump.
 
     Returns:
-        dict: Mock device details response.
+        MappingProxyType: Read-only mock device details response.
     """
-    return {
-        "id": "device-001",
-        "product": {"name": "Nibe F1155", "brand": "Nibe", "productSeries": "F-series"},
-        "connectionStatus": "ONLINE",
-        "lastStatusUpdateTime": "2025-10-19T14:30:00Z",
-        "firmwareVersion": "6.125",
-        "serialNumber": "ABC123456",
-    }
-
-
-@pytest.fixture
+    return MappingProxyType(
+        {
+            "id": "device-001",
+            "product": {"name": "Nibe F1155", "brand": "Nibe", "productSeries": "F-series"},
+            "connectionStatus": "ONLINE",
+            "lastStatusUpdateTime": "2025-10-19T14:30:00Z",
+            "firmwareVersion": "6.125",
+            "serialNumber": "ABC123456",
+        }
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_device_details_ivt():
     """Return mock device details for an IVT heat pump.
 
     Returns:
-        dict: Mock device details response.
+        MappingProxyType: Read-only mock device details response.
+    """
+    return MappingProxyType(
+        {
+            "id": "device-002",
+            "product": {"name": "IVT GEO 6", "brand": "IVT", "productSeries": "GEO-series"},
+            "connectionStatus": "ONLINE",
+            "lastStatusUpdateTime": "2025-10-19T14:30:00Z",
+            "firmwareVersion": "5.50",
+            "serialNumber": "XYZ789012",
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def mock_device_details_all(mock_device_details_nibe, mock_device_details_ivt):
+    """Return the mock device details keyed by device ID.
+
+    Args:
+        mock_device_details_nibe: Nibe device details fixture.
+        mock_device_details_ivt: IVT device details fixture.
+
+    Returns:
+        dict: Device details responses keyed by device ID.
     """
     return {
-        "id": "device-002",
-        "product": {"name": "IVT GEO 6", "brand": "IVT", "productSeries": "GEO-series"},
-        "connectionStatus": "ONLINE",
-        "lastStatusUpdateTime": "2025-10-19T14:30:00Z",
-        "firmwareVersion": "5.50",
-        "serialNumber": "XYZ789012",
+        mock_device_details_nibe["id"]: mock_device_details_nibe,
+        mock_device_details_ivt["id"]: mock_device_details_ivt,
     }
 
 
-@pytest.fixture
-def mock_device_points_response():
-    """Return mock response for /v2/devices/{id}/points API endpoint.
+@pytest.fixture(scope="session", params=["device-001", "device-002"], ids=["nibe", "ivt"])
+def mock_device_details(request, mock_device_details_all):
+    """Return each mock device's details in turn.
+
+    Tests using this fixture run once per mock device.
+
+    Args:
+        request: pytest fixture request carrying the device ID parameter.
+        mock_device_details_all: Device details keyed by device ID fixture.
 
     Returns:
-        dict: Mock device points data.
+        MappingProxyType: Read-only mock device details response.
     """
-    return {
-        "points": [
-            {
-                "parameterId": 40004,
-                "parameterName": "Actual room temperature",
-                "parameterUnit": "°C",
-                "value": 21.5,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 40012,
-                "parameterName": "BT21 Outdoor temperature",
-                "parameterUnit": "°C",
-                "value": 8.2,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 40940,
-                "parameterName": "Hot water storage",
-                "parameterUnit": "°C",
-                "value": 52.3,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 43009,
-                "parameterName": "Heating status",
-                "parameterUnit": "",
-                "value": "ON",
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 60720,
-                "parameterName": "Text not found: id[60720], fw[noem-h], lang[en-US]",
-                "parameterUnit": "",
-                "value": 2023,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-        ]
-    }
+    return mock_device_details_all[request.param]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_device_points_response():
+    """Return mock response for /v2/devices/{id}/points API endpoint.
+
+    Returns:
+        MappingProxyType: Read-only mock device points data.
+    """
+    return MappingProxyType(
+        {
+            "points": [
+                {
+                    "parameterId": 40004,
+                    "parameterName": "Actual room temperature",
+                    "parameterUnit": "°C",
+                    "value": 21.5,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 40012,
+                    "parameterName": "BT21 Outdoor temperature",
+                    "parameterUnit": "°C",
+                    "value": 8.2,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 40940,
+                    "parameterName": "Hot water storage",
+                    "parameterUnit": "°C",
+                    "value": 52.3,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 43009,
+                    "parameterName": "Heating status",
+                    "parameterUnit": "",
+                    "value": "ON",
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 60720,
+                    "parameterName": "Text not found: id[60720], fw[noem-h], lang[en-US]",
+                    "parameterUnit": "",
+                    "value": 2023,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+            ]
+        }
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_device_points_with_label_cleanup():
     """Return mock device points with label cleanup scenarios.
 
     Returns:
-        dict: Mock device points with special characters and formatting.
+        MappingProxyType: Read-only mock device points with special characters and formatting.
     """
-    return {
-        "points": [
-            {
-                "parameterId": 40001,
-                "parameterName": "SAK (SAK Operating mode)",
-                "parameterUnit": "",
-                "value": "Manual",
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 40002,
-                "parameterName": "Hot water (Ratio hot water defrost)",
-                "parameterUnit": "",
-                "value": 0.5,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-            {
-                "parameterId": 40003,
-                "parameterName": "Temperature\u00ad sensor",
-                "parameterUnit": "°C",
-                "value": 20.5,
-                "timestamp": "2025-10-19T14:30:00Z",
-            },
-        ]
-    }
+    return MappingProxyType(
+        {
+            "points": [
+                {
+                    "parameterId": 40001,
+                    "parameterName": "SAK (SAK Operating mode)",
+                    "parameterUnit": "",
+                    "value": "Manual",
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 40002,
+                    "parameterName": "Hot water (Ratio hot water defrost)",
+                    "parameterUnit": "",
+                    "value": 0.5,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+                {
+                    "parameterId": 40003,
+                    "parameterName": "Temperature\u00ad sensor",
+                    "parameterUnit": "°C",
+                    "value": 20.5,
+                    "timestamp": "2025-10-19T14:30:00Z",
+                },
+            ]
+        }
+    )
 
 
 # ============================================================================
@@ -227,52 +273,61 @@ def mock_device_points_with_label_cleanup():
 # ============================================================================
 
 
+class MockOAuthSession:
+    """Stand-in for OAuth2Session that only provides get.
+
+    Unlike a SimpleNamespace it is hashable and weak-referenceable, like a
+    real session, so it can key the per-session ETag cache.
+    """
+
+    def __init__(self, get):
+        """Initialize the stand-in session.
+
+        Args:
+            get: Mock used as the session's get method.
+        """
+        self.get = get
+
+
 @pytest.fixture
 def mock_oauth_session(
     mock_systems_response,
-    mock_device_details_nibe,
-    mock_device_details_ivt,
+    mock_device_details_all,
     mock_device_points_response,
 ):
     """Return a mock OAuth2Session object.
 
     Args:
         mock_systems_response: Systems endpoint response fixture.
-        mock_device_details_nibe: Nibe device details fixture.
-        mock_device_details_ivt: IVT device details fixture.
+        mock_device_details_all: Device details keyed by device ID fixture.
         mock_device_points_response: Device points response fixture.
 
     Returns:
-        Mock: Mock OAuth2Session configured with side effects.
+        MockOAuthSession: Stand-in OAuth2Session whose get is a Mock with side effects.
     """
-    mock_session = MagicMock()
+    # Response bodies keyed by URL path; any device's points share one response
+    routes = {"/v2/systems/me": mock_systems_response}
+    for device_id, details in mock_device_details_all.items():
+        routes[f"/v2/devices/{device_id}"] = details
 
     def mock_get(url, *args, **kwargs):
-        """Mock GET requests based on URL patterns."""
+        """Mock GET requests based on the URL path."""
         response = Mock()
         response.status_code = 200
+        response.headers = {}
 
-        # Route based on URL
-        if "/v2/systems/me" in url:
-            response.json.return_value = mock_systems_response
-        elif "/v2/devices/device-001" in url and "/points" not in url:
-            response.json.return_value = mock_device_details_nibe
-        elif "/v2/devices/device-002" in url and "/points" not in url:
-            response.json.return_value = mock_device_details_ivt
-        elif "/v2/devices/device-001/points" in url:
-            response.json.return_value = mock_device_points_response
-        elif "/v2/devices/device-002/points" in url:
-            response.json.return_value = mock_device_points_response
-        elif "/v2/devices" in url and "/points" in url:
-            response.json.return_value = mock_device_points_response
-        else:
+        path = urlsplit(url).path
+        body = routes.get(path)
+        if body is None and path.startswith("/v2/devices/") and path.endswith("/points"):
+            body = mock_device_points_response
+        if body is None:
             response.status_code = 404
-            response.json.return_value = {"error": "Not found"}
+            body = {"error": "Not found"}
 
+        response.json.return_value = body
         return response
 
-    mock_session.get.side_effect = mock_get
-    return mock_session
+    return MockOAuthSession(Mock(side_effect=mock_get))
 
 
 @pytest.fixture
@@ -280,20 +335,19 @@ def mock_oauth_session_with_errors():
     """Return a mock OAuth2Session that returns HTTP errors.
 
     Returns:
-        Mock: Mock OAuth2Session configured to return errors.
+        MockOAuthSession: Stand-in OAuth2Session whose get returns errors.
     """
-    mock_session = MagicMock()
 
     def mock_get_error(url, *args, **kwargs):
         """Mock GET requests that return error responses."""
         response = Mock()
         response.status_code = 401
+        response.headers = {}
         response.text = "Unauthorized"
         response.json.return_value = {"error": "Invalid token"}
         return response
 
-    mock_session.get.side_effect = mock_get_error
-    return mock_session
+    return MockOAuthSession(Mock(side_effect=mock_get_error))
 
 
 # ============================================================================
@@ -310,7 +364,8 @@ def mock_mqtt_client():
     """
     mock_client = MagicMock()
     mock_client.connect.return_value = 0
-    mock_client.publish.return_value = MagicMock(rc=0)
+    publish_result = MagicMock(rc=0)
+    mock_client.publish.return_value = publish_result
     mock_client.disconnect.return_value = 0
     mock_client.is_connected.return_value = True
 
@@ -320,7 +375,7 @@ def mock_mqtt_client():
     def track_publish(topic, payload, *args, **kwargs):
         """Track published messages."""
         mock_client.published_messages.append({"topic": topic, "payload": payload})
-        return MagicMock(rc=0)
+        return publish_result
 
     mock_client.publish.side_effect = track_publish
     return mock_client
@@ -333,11 +388,13 @@ class MockMQTTBroker:
     without needing an actual MQTT server.
     """
 
+    __slots__ = ("connections", "messages", "subscriptions")
+
     def __init__(self):
         """Initialize the mock broker with empty message store."""
-        self.messages = {}
+        self.messages = defaultdict(list)
         self.connections = []
-        self.subscriptions = {}
+        self.subscriptions = defaultdict(list)
 
     def publish(self, topic, payload, qos=0, retain=False):
         """Simulate publishing a message.
@@ -351,9 +408,6 @@ class MockMQTTBroker:
         Returns:
             dict: Result with 'rc' (return code) as 0 for success.
         """
-        if topic not in self.messages:
-            self.messages[topic] = []
-
         self.messages[topic].append(
             {"payload": payload, "qos": qos, "retain": retain, "timestamp": None}
         )
@@ -365,8 +419,6 @@ class MockMQTTBroker:
         Args:
             topic (str): MQTT topic or topic filter.
         """
-        if topic not in self.subscriptions:
-            self.subscriptions[topic] = []
         self.subscriptions[topic].append({})
 
     def get_messages(self, topic):
@@ -386,12 +438,12 @@ class MockMQTTBroker:
         Returns:
             dict: Dictionary mapping topics to lists of messages.
         """
-        return self.messages
+        return dict(self.messages)
 
     def clear(self):
         """Clear all stored messages."""
-        self.messages = {}
-        self.subscriptions = {}
+        self.messages.clear()
+        self.subscriptions.clear()
 
 
 @pytest.fixture
@@ -410,13 +462,12 @@ def mock_mqtt_broker():
 
 
 @pytest.fixture
-def patch_config_paths(tmp_path, mock_oauth_token, mock_config):
+def patch_config_paths(tmp_path, config_files_json):
     """Patch configuration file paths to use temporary files.
 
     Args:
         tmp_path: pytest's temporary directory fixture.
-        mock_oauth_token: Mock token data fixture.
-        mock_config: Mock config data fixture.
+        config_files_json: Serialized config and token fixture.
 
     Yields:
         tuple: (config_path, token_path) for reference in tests.
@@ -424,8 +475,9 @@ def patch_config_paths(tmp_path, mock_oauth_token, mock_config):
     config_file = tmp_path / "config.json"
     token_file = tmp_path / "token.json"
 
-    config_file.write_text(json.dumps(mock_config))
-    token_file.write_text(json.dumps(mock_oauth_token))
+    config_json, token_json = config_files_json
+    config_file.write_text(config_json)
+    token_file.write_text(token_json)
 
     config_path = str(config_file)
     token_path = str(token_file)
@@ -468,23 +520,3 @@ def patch_env_credentials():
 
     with patch.dict(os.environ, env_vars, clear=False):
         yield env_vars
-
-
-# ============================================================================
-# Async Test Support
-# ============================================================================
-
-
-@pytest.fixture
-def event_loop():
-    """Create an event loop for async tests.
-
-    Yields:
-        asyncio.AbstractEventLoop: Event loop for async test execution.
-    """
-    import asyncio
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    loop.close()
@@ -7,7 +7,7 @@ including payload generation, device class mapping, and parameter handling.
 import json
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -15,7 +15,9 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from myuplink2mqtt.utils.auto_discovery_utils import (  # pylint: disable=wrong-import-position
+    build_device_block,
     build_discovery_payload,
+    clean_enum_text,
     clean_parameter_name,
     determine_device_class,
     determine_entity_category,
@@ -24,6 +26,7 @@ from myuplink2mqtt.utils.auto_discovery_utils import (  # pylint: disable=wrong-
     get_unit_to_device_class_mapping,
     normalize_unit,
     publish_ha_discovery,
+    reload_config,
 )
 
 
@@ -211,6 +214,36 @@ class TestDetermineEntityCategory:
         category = determine_entity_category("12345", "Regular sensor value")
         assert category is None
 
+    def test_repeated_parameter_is_cached(self):
+        """Test that a repeated parameter is answered from the cache."""
+        determine_entity_category("40004", "Outdoor temperature")
+        hits = determine_entity_category.cache_info().hits
+
+        assert determine_entity_category("40004", "Outdoor temperature") is None
+        assert determine_entity_category.cache_info().hits == hits + 1
+
+
+class TestCleanEnumText:
+    """Test enum text cleaning."""
+
+    def test_collapses_multiple_spaces(self):
+        """Test that runs of spaces become a single space."""
+        assert clean_enum_text("Auto    mode") == "Auto mode"
+
+    def test_removes_line_breaks(self):
+        """Test that embedded CR/LF sequences are removed, not turned into spaces."""
+        assert clean_enum_text("Heating\r\nmode ") == "Heatingmode"
+        assert clean_enum_text("Heating \r\n mode\r\n") == "Heating mode"
+
+    def test_keeps_other_whitespace(self):
+        """Test that tabs inside the label are left as they are."""
+        assert clean_enum_text("Auto\tmode") == "Auto\tmode"
+
+    def test_empty_text(self):
+        """Test that empty values are returned unchanged."""
+        assert clean_enum_text("") == ""
+        assert clean_enum_text(None) is None
+
 
 class TestCleanParameterName:
     """Test parameter name cleaning."""
@@ -230,6 +263,11 @@ class TestCleanParameterName:
         result = clean_parameter_name("Device (Param (nested))", "Device")
         assert result == "Param (nested)"
 
+    def test_clean_name_prefix_closed_before_end(self):
+        """Test that a prefix closed before the end is not stripped."""
+        result = clean_parameter_name("Device (Param) (extra)", "Device")
+        assert result == "Device (Param) (extra)"
+
     def test_clean_name_no_closing_paren(self):
         """Test handling of malformed names without closing parenthesis."""
         result = clean_parameter_name("Device (Param without close", "Device")
@@ -464,6 +502,60 @@ class TestBuildDiscoveryPayload:
         assert payload["payload_available"] == "online"
         assert payload["payload_not_available"] == "offline"
 
+    def test_device_block_matches_inline_device(self):
+        """Test that build_device_block matches the payload's own device section."""
+        device_info = self.get_sample_device_info()
+        parameter_info = self.get_sample_parameter_info()
+
+        payload = build_discovery_payload(
+            device_info, parameter_info, "myuplink/sys1/40004/value", "myuplink/sys1/available"
+        )
+
+        assert build_device_block(device_info) == payload["device"]
+        assert payload["device"]["serial_number"] == "ABC123"
+
+    def test_shared_device_block_is_reused(self):
+        """Test that a prebuilt device block is used as-is."""
+        device_info = self.get_sample_device_info()
+        device_block = build_device_block(device_info)
+
+        payload = build_discovery_payload(
+            device_info,
+            self.get_sample_parameter_info(),
+            "myuplink/sys1/40004/value",
+            "myuplink/sys1/available",
+            device_block,
+        )
+
+        assert payload["device"] is device_block
+
+    def test_enum_command_topic_uses_system_id(self):
+        """Test that enum parameters get a command topic for the given system."""
+        parameter_info = self.get_sample_parameter_info()
+        parameter_info["value"] = 1.0
+        parameter_info["enum_values"] = [
+            {"value": "0", "text": "Off"},
+            {"value": "1", "text": "On"},
+        ]
+        state_topic = "myuplink/sys1/40004/value"
+        availability_topic = "myuplink/sys1/available"
+
+        payload = build_discovery_payload(
+            self.get_sample_device_info(),
+            parameter_info,
+            state_topic,
+            availability_topic,
+            system_id="sys2",
+        )
+        assert payload["command_topic"] == "myuplink/sys2/40004/set"
+        assert payload["value_template"] == "{{ value }}"
+
+        # Without an explicit system_id it is taken from the state topic
+        payload = build_discovery_payload(
+            self.get_sample_device_info(), parameter_info, state_topic, availability_topic
+        )
+        assert payload["command_topic"] == "myuplink/sys1/40004/set"
+
 
 class TestPublishHaDiscovery:
     """Test Home Assistant discovery publishing."""
@@ -567,6 +659,24 @@ class TestPublishHaDiscovery:
         # Topic should use binary_sensor component
         assert "homeassistant/binary_sensor/" in topic
 
+    def test_publish_uses_shared_device_block(self):
+        """Test that a prebuilt device block is published as the payload's device."""
+        mock_client = MagicMock()
+        device_info = self.get_sample_device_info()
+        device_block = build_device_block(device_info)
+
+        result = publish_ha_discovery(
+            mock_client,
+            device_info,
+            self.get_sample_parameter_info(),
+            "system1",
+            device_block=device_block,
+        )
+
+        assert result is True
+        payload = json.loads(mock_client.publish.call_args[0][1])
+        assert payload["device"] == device_block
+
     def test_publish_handles_missing_parameter_fields(self):
         """Test that publish handles missing optional fields gracefully."""
         mock_client = MagicMock()
@@ -586,5 +696,44 @@ class TestPublishHaDiscovery:
         mock_client.publish.assert_called_once()
 
 
+class TestReloadConfig:
+    """Test reloading topic configuration from the environment."""
+
+    def test_reload_picks_up_new_base_topic(self, monkeypatch):
+        """Test that published topics use the reloaded base topic."""
+        monkeypatch.setenv("MQTT_BASE_TOPIC", "reloaded")
+        monkeypatch.setenv("HA_DISCOVERY_PREFIX", "domoticz")
+        mock_client = MagicMock()
+        device_info = {"id": "device123", "name": "SAK", "manufacturer": "IVT", "model": "GT"}
+        parameter_info = {"id": "40004", "name": "Temp", "unit": "°C", "value_type": "float"}
+
+        try:
+            reload_config()
+            publish_ha_discovery(mock_client, device_info, parameter_info, "system1")
+        finally:
+            monkeypatch.undo()
+            reload_config()
+
+        topic, payload_str = mock_client.publish.call_args[0][:2]
+        assert topic.startswith("domoticz/sensor/")
+        assert json.loads(payload_str)["state_topic"] == "reloaded/system1/40004/value"
+
+    def test_patched_constants_take_effect(self):
+        """Test that patching the exported constants changes the published topics."""
+        mock_client = MagicMock()
+        device_info = {"id": "device123", "name": "SAK", "manufacturer": "IVT", "model": "GT"}
+        parameter_info = {"id": "40004", "name": "Temp", "unit": "°C", "value_type": "float"}
+
+        module = "myuplink2mqtt.utils.auto_discovery_utils"
+        with patch(f"{module}.MQTT_BASE_TOPIC", "patched"), patch(
+            f"{module}.HA_DISCOVERY_PREFIX", "domoticz"
+        ):
+            publish_ha_discovery(mock_client, device_info, parameter_info, "system1")
+
+        topic, payload_str = mock_client.publish.call_args[0][:2]
+        assert topic.startswith("domoticz/sensor/")
+        assert json.loads(payload_str)["state_topic"] == "patched/system1/40004/value"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
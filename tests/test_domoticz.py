@@ -0,0 +1,447 @@
+"""Tests for Domoticz JSON API client.
+
+Tests the DomoticzClient session handling, device list caching and
+lookups with the HTTP session mocked out.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add project root to path before importing local modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from myuplink2mqtt.utils.domoticz_json_util import (  # pylint: disable=wrong-import-position
+    DOMOTICZ_API_DEVICES,
+    DOMOTICZ_API_SWITCH_LIGHT,
+    RETRY_STATUS_FORCELIST,
+    RETRY_TOTAL,
+    DomoticzClient,
+    create_domoticz_client,
+)
+
+DEVICES = [
+    {"idx": "1", "Name": "Outdoor Temp", "HardwareName": "MQTT Gateway"},
+    {"idx": "2", "Name": "Kitchen Light", "HardwareName": "Zigbee"},
+]
+
+
+def make_response(status_code=200, body=None, etag=None):
+    """Build a mocked requests response.
+
+    Args:
+        status_code: HTTP status code.
+        body: JSON body returned by response.json().
+        etag: Optional ETag response header.
+
+    Returns:
+        Mock: Mocked response.
+    """
+    response = Mock(status_code=status_code, headers={"ETag": etag} if etag else {})
+    response.json.return_value = body
+    return response
+
+
+def devices_response(devices=None, etag=None):
+    """Build a mocked getdevices response.
+
+    Args:
+        devices: Device list, defaults to DEVICES.
+        etag: Optional ETag response header.
+
+    Returns:
+        Mock: Mocked response.
+    """
+    devices = DEVICES if devices is None else devices
+    return make_response(body={"status": "OK", "result": devices}, etag=etag)
+
+
+@pytest.fixture
+def domoticz_client():
+    """Create a DomoticzClient for a local test host.
+
+    Returns:
+        DomoticzClient: Client instance.
+    """
+    client = DomoticzClient("domoticz.local", 8080)
+    yield client
+    client.close()
+
+
+# ============================================================================
+# Tests for session lifecycle
+# ============================================================================
+
+
+class TestSessionLifecycle:
+    """Test the pooled session is closed with the client."""
+
+    def test_close_closes_session(self, domoticz_client):
+        """Test close() closes the underlying session.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        with patch.object(domoticz_client.session, "close") as mock_close:
+            domoticz_client.close()
+
+        mock_close.assert_called_once()
+
+    def test_context_manager_closes_session(self, domoticz_client):
+        """Test leaving the with block closes the session.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        session = domoticz_client.session
+        with patch.object(session, "close") as mock_close, domoticz_client as client:
+            assert client is domoticz_client
+            mock_close.assert_not_called()
+
+        mock_close.assert_called_once()
+
+    def test_context_manager_closes_session_on_error(self, domoticz_client):
+        """Test the session is closed when the with block raises.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        mock_close = domoticz_client.session.close = Mock()
+
+        with pytest.raises(RuntimeError), domoticz_client:
+            raise RuntimeError("boom")
+
+        mock_close.assert_called_once()
+
+    @patch.object(DomoticzClient, "close")
+    @patch.object(DomoticzClient, "verify_connection", return_value=False)
+    def test_create_client_closes_on_failed_verify(self, mock_verify, mock_close):
+        """Test create_domoticz_client closes the client it cannot verify.
+
+        Args:
+            mock_verify: Mocked verify_connection method.
+            mock_close: Mocked close method.
+        """
+        assert create_domoticz_client("domoticz.local") is None
+
+        mock_verify.assert_called_once()
+        mock_close.assert_called_once()
+
+
+# ============================================================================
+# Tests for retry adapters
+# ============================================================================
+
+
+class TestRetryAdapters:
+    """Test reads are retried while switch commands are sent once."""
+
+    def test_device_reads_are_retried(self, domoticz_client):
+        """Test device list requests go through the retrying adapter.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        url = f"{domoticz_client.base_url}{DOMOTICZ_API_DEVICES}"
+        retries = domoticz_client.session.get_adapter(url).max_retries
+
+        assert retries.total == RETRY_TOTAL
+        assert retries.status_forcelist == RETRY_STATUS_FORCELIST
+        assert retries.allowed_methods == frozenset(["GET"])
+
+    def test_switch_commands_are_not_retried(self, domoticz_client):
+        """Test switch commands use an adapter without retries.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        url = f"{domoticz_client.base_url}{DOMOTICZ_API_SWITCH_LIGHT}&idx=2&switchcmd=On"
+
+        assert domoticz_client.session.get_adapter(url).max_retries.total == 0
+
+    def test_https_client_mounts_same_adapters(self):
+        """Test the retry split also applies to HTTPS clients."""
+        with DomoticzClient("domoticz.local", 443, use_https=True) as client:
+            devices_url = f"{client.base_url}{DOMOTICZ_API_DEVICES}"
+            switch_url = f"{client.base_url}{DOMOTICZ_API_SWITCH_LIGHT}"
+
+            assert client.session.get_adapter(devices_url).max_retries.total == RETRY_TOTAL
+            assert client.session.get_adapter(switch_url).max_retries.total == 0
+
+
+# ============================================================================
+# Tests for device list caching
+# ============================================================================
+
+
+class TestDeviceListCache:
+    """Test the device list is reused within the cache TTL."""
+
+    def test_second_call_within_ttl_skips_request(self, domoticz_client):
+        """Test a second get_devices() within the TTL makes no HTTP request.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        with patch.object(domoticz_client.session, "get", return_value=devices_response()) as get:
+            first = domoticz_client.get_devices()
+            second = domoticz_client.get_devices()
+
+        assert first == DEVICES
+        assert second is first
+        get.assert_called_once()
+        assert get.call_args[0][0].endswith(DOMOTICZ_API_DEVICES)
+
+    @patch("myuplink2mqtt.utils.domoticz_json_util.time.monotonic")
+    def test_expired_cache_refetches(self, mock_monotonic, domoticz_client):
+        """Test get_devices() requests the list again once the TTL has passed.
+
+        Args:
+            mock_monotonic: Mocked time.monotonic.
+            domoticz_client: Domoticz client fixture.
+        """
+        mock_monotonic.side_effect = [100.0, 100.0 + domoticz_client.cache_ttl + 1]
+
+        with patch.object(domoticz_client.session, "get", return_value=devices_response()) as get:
+            domoticz_client.get_devices()
+            domoticz_client.get_devices()
+
+        assert get.call_count == 2
+
+    def test_failed_request_is_not_cached(self, domoticz_client):
+        """Test an error response is not served from the cache.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        responses = [make_response(status_code=500), devices_response()]
+        with patch.object(domoticz_client.session, "get", side_effect=responses) as get:
+            assert domoticz_client.get_devices() is None
+            assert domoticz_client.get_devices() == DEVICES
+
+        assert get.call_count == 2
+
+    def test_set_device_state_invalidates_cache(self, domoticz_client):
+        """Test set_device_state() makes the next get_devices() hit the API.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        switched = make_response(body={"status": "OK"})
+        responses = [devices_response(), switched, devices_response()]
+        with patch.object(domoticz_client.session, "get", side_effect=responses) as get:
+            domoticz_client.get_devices()
+            assert domoticz_client.set_device_state(2, "On") is True
+            domoticz_client.get_devices()
+
+        assert get.call_count == 3
+        assert get.call_args_list[1][1]["params"] == {"idx": 2, "switchcmd": "On"}
+        assert get.call_args_list[2][0][0].endswith(DOMOTICZ_API_DEVICES)
+
+    def test_invalidate_cache(self, domoticz_client):
+        """Test invalidate_cache() drops the cached device list.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        with patch.object(domoticz_client.session, "get", return_value=devices_response()) as get:
+            domoticz_client.get_devices()
+            domoticz_client.invalidate_cache()
+            domoticz_client.get_devices()
+
+        assert get.call_count == 2
+
+
+# ============================================================================
+# Tests for conditional requests
+# ============================================================================
+
+
+class TestConditionalRequests:
+    """Test ETag revalidation of the device list."""
+
+    def test_not_modified_returns_cached_body(self, domoticz_client):
+        """Test a 304 reply reuses the body stored with the ETag.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        responses = [devices_response(etag='"v1"'), make_response(status_code=304)]
+        with patch.object(domoticz_client.session, "get", side_effect=responses) as get:
+            first = domoticz_client.get_devices()
+            domoticz_client.invalidate_cache()
+            second = domoticz_client.get_devices()
+
+        assert second == DEVICES
+        assert second is first
+        assert get.call_args_list[0][1]["headers"] is None
+        assert get.call_args_list[1][1]["headers"] == {"If-None-Match": '"v1"'}
+        responses[1].json.assert_not_called()
+
+    def test_changed_body_replaces_etag(self, domoticz_client):
+        """Test a new 200 reply replaces the stored ETag and body.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        updated = [{"idx": "3", "Name": "Heat Pump"}]
+        responses = [
+            devices_response(etag='"v1"'),
+            devices_response(updated, etag='"v2"'),
+            make_response(status_code=304),
+        ]
+        with patch.object(domoticz_client.session, "get", side_effect=responses) as get:
+            domoticz_client.get_devices()
+            domoticz_client.invalidate_cache()
+            assert domoticz_client.get_devices() == updated
+            domoticz_client.invalidate_cache()
+            assert domoticz_client.get_devices() == updated
+
+        assert get.call_args_list[2][1]["headers"] == {"If-None-Match": '"v2"'}
+
+    def test_response_without_etag_is_not_conditional(self, domoticz_client):
+        """Test no If-None-Match is sent when the server sent no ETag.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        with patch.object(domoticz_client.session, "get", return_value=devices_response()) as get:
+            domoticz_client.get_devices()
+            domoticz_client.invalidate_cache()
+            domoticz_client.get_devices()
+
+        assert [call[1]["headers"] for call in get.call_args_list] == [None, None]
+
+    def test_unconditional_request_ignores_etag(self, domoticz_client):
+        """Test plain requests neither send nor store ETags.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        response = make_response(body={"status": "OK", "result": []}, etag='"v1"')
+        with patch.object(domoticz_client.session, "get", return_value=response) as get:
+            domoticz_client.get_device(1)
+            domoticz_client.get_device(1)
+
+        assert get.call_args[1]["headers"] is None
+        assert domoticz_client._etags == {}
+
+    def test_post_sends_json_body(self, domoticz_client):
+        """Test POST requests pass the data as JSON body.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        response = make_response(body={"status": "OK"})
+        with patch.object(domoticz_client.session, "post", return_value=response) as post:
+            result = domoticz_client._make_request("/json.htm", method="POST", data={"a": 1})
+
+        assert result == {"status": "OK"}
+        assert post.call_args[1]["json"] == {"a": 1}
+        assert post.call_args[1]["timeout"] == domoticz_client.timeout
+
+
+# ============================================================================
+# Tests for device lookup indexes
+# ============================================================================
+
+
+class TestDeviceIndexes:
+    """Test name and MQTT indexes follow the device list they were built from."""
+
+    def test_lookups_use_indexes(self, domoticz_client):
+        """Test name and MQTT lookups are answered from one device list.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        with patch.object(domoticz_client.session, "get", return_value=devices_response()) as get:
+            device = domoticz_client.get_device_by_name("Kitchen Light")
+            mqtt_devices = domoticz_client.find_devices_by_mqtt_id("Outdoor")
+
+        assert device["idx"] == "2"
+        assert [d["idx"] for d in mqtt_devices] == ["1"]
+        assert domoticz_client.get_device_by_name("Missing") is None
+        get.assert_called_once()
+
+    def test_duplicate_names_keep_first_device(self, domoticz_client):
+        """Test the first device wins when several share a name.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        devices = [{"idx": "1", "Name": "Pump"}, {"idx": "2", "Name": "Pump"}]
+        with patch.object(domoticz_client.session, "get", return_value=devices_response(devices)):
+            assert domoticz_client.get_device_by_name("Pump")["idx"] == "1"
+
+    def test_indexes_rebuild_after_invalidation(self, domoticz_client):
+        """Test a changed device list after invalidation rebuilds the indexes.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        renamed = [
+            {"idx": "1", "Name": "Outdoor Temperature", "HardwareName": "MQTT Gateway"},
+            {"idx": "3", "Name": "Heat Pump", "Description": "mqtt discovered"},
+        ]
+        responses = [devices_response(), devices_response(renamed)]
+        with patch.object(domoticz_client.session, "get", side_effect=responses):
+            assert domoticz_client.get_device_by_name("Kitchen Light") is not None
+            domoticz_client.invalidate_cache()
+
+            assert domoticz_client.get_device_by_name("Kitchen Light") is None
+            assert domoticz_client.get_device_by_name("Heat Pump")["idx"] == "3"
+            assert [d["idx"] for d in domoticz_client.find_devices_by_mqtt_id("")] == ["1", "3"]
+
+    def test_indexes_kept_after_not_modified(self, domoticz_client):
+        """Test a 304 revalidation reuses the indexed list without rebuilding.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        responses = [devices_response(etag='"v1"'), make_response(status_code=304)]
+        with patch.object(domoticz_client.session, "get", side_effect=responses) as get:
+            domoticz_client.get_device_by_name("Kitchen Light")
+            indexed = domoticz_client._indexed_devices
+            by_name = domoticz_client._by_name
+            domoticz_client.invalidate_cache()
+
+            assert domoticz_client.get_device_by_name("Kitchen Light")["idx"] == "2"
+
+        assert get.call_count == 2
+        assert domoticz_client._indexed_devices is indexed
+        assert domoticz_client._by_name is by_name
+
+
+# ============================================================================
+# Tests for discovery validation
+# ============================================================================
+
+
+class TestValidateDiscoveryDevices:
+    """Test discovery validation works from a single device list."""
+
+    def test_validation_uses_one_request(self, domoticz_client):
+        """Test all devices are validated from one getdevices response.
+
+        Args:
+            domoticz_client: Domoticz client fixture.
+        """
+        devices = [
+            {"idx": "1", "Name": "Temp", "HardwareName": "MQTT", "ID": "homeassistant_1"},
+            {"idx": "2", "Name": "Flow", "HardwareName": "MQTT", "ID": "homeassistant_2"},
+            {"idx": "3", "Name": "Manual", "HardwareName": "MQTT", "ID": "manual_3"},
+            {"idx": "4", "Name": "Light", "HardwareName": "Zigbee", "ID": "homeassistant_4"},
+        ]
+        with patch.object(
+            domoticz_client.session, "get", return_value=devices_response(devices)
+        ) as get:
+            result = domoticz_client.validate_discovery_devices("homeassistant")
+
+        get.assert_called_once()
+        assert result["total_devices"] == 4
+        assert result["mqtt_devices"] == 3
+        assert result["unique_auto_discovery_ids"] == 2
+        assert [device["id"] for device in result["devices"]] == ["1", "2"]
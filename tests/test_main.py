@@ -0,0 +1,293 @@
+"""Tests for the myUplink2mqtt main polling loop.
+
+Tests graceful shutdown on signals with the OAuth session, MQTT client and
+API calls mocked out.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+# Add project root to path before importing local modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from myuplink2mqtt import main  # pylint: disable=wrong-import-position
+
+# ============================================================================
+# Tests for signal handling
+# ============================================================================
+
+
+class TestShutdownHandlers:
+    """Test SIGTERM/SIGINT set the shutdown event instead of killing the process."""
+
+    @pytest.mark.parametrize("sig", [signal.SIGTERM, signal.SIGINT])
+    def test_signal_sets_shutdown_event(self, sig):
+        """Test that a received signal sets the shutdown event.
+
+        Args:
+            sig: Signal sent to the process.
+        """
+
+        async def run():
+            shutdown_event = asyncio.Event()
+            main.install_shutdown_handlers(asyncio.get_running_loop(), shutdown_event)
+            os.kill(os.getpid(), sig)
+            return await main.wait_for_shutdown(shutdown_event, 5)
+
+        assert asyncio.run(run()) is True
+
+    def test_wait_for_shutdown_times_out(self):
+        """Test that wait_for_shutdown returns False when no signal arrives."""
+
+        async def run():
+            return await main.wait_for_shutdown(asyncio.Event(), 0.01)
+
+        assert asyncio.run(run()) is False
+
+
+# ============================================================================
+# Tests for main loop shutdown
+# ============================================================================
+
+
+@pytest.fixture
+def mqtt_client():
+    """Patch the main loop's setup so it runs without OAuth or a broker.
+
+    Yields:
+        MagicMock: MQTT client returned by connect_mqtt_broker.
+    """
+    client = MagicMock()
+    with patch.multiple(
+        main,
+        setup_oauth_session=MagicMock(return_value=MagicMock()),
+        connect_mqtt_broker=MagicMock(return_value=client),
+        PUBLISH_TO_MQTT=True,
+        RUN_ONCE=False,
+        POLL_INTERVAL=60,
+    ):
+        yield client
+
+
+class TestMainLoopShutdown:
+    """Test main_loop stops polling and disconnects cleanly on SIGTERM."""
+
+    def test_sigterm_ends_main_loop(self, mqtt_client):
+        """Test SIGTERM during the poll interval ends the loop and disconnects first.
+
+        Args:
+            mqtt_client: Mocked MQTT client fixture.
+        """
+
+        def poll_cycle(myuplink, client, loop_count):
+            os.kill(os.getpid(), signal.SIGTERM)
+            return 0
+
+        with patch.object(main, "process_poll_cycle", side_effect=poll_cycle) as mock_poll:
+            assert asyncio.run(asyncio.wait_for(main.main_loop(), timeout=5)) is True
+
+        mock_poll.assert_called_once()
+        shutdown_calls = [name for name, _args, _kwargs in mqtt_client.mock_calls]
+        assert shutdown_calls == ["disconnect", "loop_stop"]
+
+    def test_disconnects_after_poll_error(self, mqtt_client):
+        """Test the MQTT client is disconnected when a poll cycle fails.
+
+        Args:
+            mqtt_client: Mocked MQTT client fixture.
+        """
+        with patch.object(main, "process_poll_cycle", side_effect=RuntimeError("boom")):
+            assert asyncio.run(main.main_loop()) is True
+
+        shutdown_calls = [name for name, _args, _kwargs in mqtt_client.mock_calls]
+        assert shutdown_calls == ["disconnect", "loop_stop"]
+
+
+# ============================================================================
+# Tests for poll cycles
+# ============================================================================
+
+
+SYSTEMS = [
+    {"systemId": "system-1", "name": "House", "devices": [{"id": "dev-1"}, {"id": "dev-2"}]},
+    {"systemId": "system-2", "name": "Cabin", "devices": [{"id": "dev-3"}]},
+]
+
+
+class TestProcessPollCycle:
+    """Test a poll cycle fetches each system's devices in one batch."""
+
+    def test_fetches_devices_once_per_system(self):
+        """Test get_devices_data is called once per system with its device IDs."""
+        myuplink = MagicMock()
+        devices_data = {
+            ("dev-1", "dev-2"): [("details-1", "points-1"), ("details-2", "points-2")],
+            ("dev-3",): [("details-3", "points-3")],
+        }
+
+        def get_devices_data(session, device_ids):
+            return devices_data[tuple(device_ids)]
+
+        with patch.object(main, "get_systems", return_value=SYSTEMS), patch.object(
+            main, "get_devices_data", side_effect=get_devices_data
+        ) as mock_get_data, patch.object(main, "process_device", return_value=2) as mock_process:
+            published = main.process_poll_cycle(myuplink, "mqtt", 1)
+
+        assert published == 6
+        assert mock_get_data.call_args_list == [
+            call(myuplink, ["dev-1", "dev-2"]),
+            call(myuplink, ["dev-3"]),
+        ]
+        assert mock_process.call_args_list == [
+            call("mqtt", "system-1", "dev-1", "details-1", "points-1", True),
+            call("mqtt", "system-1", "dev-2", "details-2", "points-2", True),
+            call("mqtt", "system-2", "dev-3", "details-3", "points-3", True),
+        ]
+
+    def test_discovery_only_on_first_cycle(self):
+        """Test discovery is requested from process_device on the first cycle only."""
+        systems = SYSTEMS[1:]
+
+        with patch.object(main, "get_systems", return_value=systems), patch.object(
+            main, "get_devices_data", return_value=[("details-3", "points-3")]
+        ), patch.object(main, "process_device", return_value=1) as mock_process:
+            main.process_poll_cycle(MagicMock(), "mqtt", 2)
+
+        assert mock_process.call_args.args[-1] is False
+
+    def test_failed_systems_request(self):
+        """Test nothing is fetched when the systems request fails."""
+        with patch.object(main, "get_systems", return_value=None), patch.object(
+            main, "get_devices_data"
+        ) as mock_get_data:
+            assert main.process_poll_cycle(MagicMock(), "mqtt", 1) == 0
+
+        mock_get_data.assert_not_called()
+
+
+# ============================================================================
+# Tests for data point publishing
+# ============================================================================
+
+
+POINTS = [
+    {"parameterId": "40004", "parameterName": "Outdoor temp", "parameterUnit": "°C", "value": 5},
+    {"parameterId": "8556", "parameterName": "Installation year", "value": 2020},
+    {"parameterId": "47011", "parameterName": "Heat curve", "value": 0, "strVal": "Not used"},
+    {"parameterId": "10733", "parameterName": "Fan speed", "value": 2},
+]
+
+
+@pytest.fixture
+def publish_mocks():
+    """Patch the discovery and state publishers with one call recorder.
+
+    Yields:
+        MagicMock: Parent mock recording publish_ha_discovery and
+            publish_sensor_state calls in order.
+    """
+    manager = MagicMock()
+    with patch.multiple(
+        main,
+        publish_ha_discovery=manager.publish_ha_discovery,
+        publish_sensor_state=manager.publish_sensor_state,
+        PUBLISH_TO_MQTT=True,
+        SEND_ALL_PARAMETERS=False,
+    ):
+        yield manager
+
+
+class TestProcessDataPoints:
+    """Test data points are filtered and published in the right order."""
+
+    def test_without_discovery_builds_no_discovery_fields(self, publish_mocks):
+        """Test no discovery fields are built when discovery is not sent.
+
+        Args:
+            publish_mocks: Publisher call recorder fixture.
+        """
+        with patch.object(main, "determine_value_type") as mock_value_type, patch.object(
+            main, "determine_entity_category"
+        ) as mock_category:
+            published, discovery_sent = main.process_data_points(
+                MagicMock(), {"id": "dev-1"}, "system-1", POINTS, False
+            )
+
+        assert (published, discovery_sent) == (2, 0)
+        publish_mocks.publish_ha_discovery.assert_not_called()
+        mock_value_type.assert_not_called()
+        mock_category.assert_not_called()
+        assert [c.args[2] for c in publish_mocks.publish_sensor_state.call_args_list] == [
+            "40004",
+            "10733",
+        ]
+
+    def test_discovery_published_before_each_state(self, publish_mocks):
+        """Test each point's discovery config is published right before its state.
+
+        Args:
+            publish_mocks: Publisher call recorder fixture.
+        """
+        mqtt_client = MagicMock()
+        device_info = {"id": "dev-1", "manufacturer": "Nibe", "model": "F730"}
+
+        published, discovery_sent = main.process_data_points(
+            mqtt_client, device_info, "system-1", POINTS, True
+        )
+
+        assert (published, discovery_sent) == (2, 2)
+        assert [name for name, _args, _kwargs in publish_mocks.mock_calls] == [
+            "publish_ha_discovery",
+            "publish_sensor_state",
+            "publish_ha_discovery",
+            "publish_sensor_state",
+        ]
+        discovery_calls = publish_mocks.publish_ha_discovery.call_args_list
+        assert [c.args[3] for c in discovery_calls] == ["system-1", "system-1"]
+        # One device block is shared by all of the device's payloads
+        first_block, second_block = (c.kwargs["device_block"] for c in discovery_calls)
+        assert first_block is second_block
+        assert first_block["identifiers"] == ["myuplink_dev-1"]
+        outdoor = discovery_calls[0].args[2]
+        assert outdoor["id"] == "40004"
+        assert outdoor["name"] == "Outdoor temp"
+        assert outdoor["unit"] == "°C"
+        assert "value_type" in outdoor
+        assert "category" in outdoor
+
+    def test_nothing_published_without_client(self, publish_mocks):
+        """Test points are counted but not published without an MQTT client.
+
+        Args:
+            publish_mocks: Publisher call recorder fixture.
+        """
+        assert main.process_data_points(None, {"id": "dev-1"}, "system-1", POINTS, True) == (2, 0)
+        assert publish_mocks.mock_calls == []
+
+
+class TestTopicConfiguration:
+    """Test main builds its topics from the shared auto-discovery configuration."""
+
+    def test_state_topic_follows_reloaded_base_topic(self, monkeypatch):
+        """Test state topics use the base topic after reload_config().
+
+        Args:
+            monkeypatch: pytest monkeypatch fixture.
+        """
+        monkeypatch.setenv("MQTT_BASE_TOPIC", "reloaded")
+        mqtt_client = MagicMock()
+
+        try:
+            main.auto_discovery_utils.reload_config()
+            main.publish_sensor_state(mqtt_client, "system-1", "40004", 1.5)
+        finally:
+            monkeypatch.undo()
+            main.auto_discovery_utils.reload_config()
+
+        assert mqtt_client.publish.call_args.args[0] == "reloaded/system-1/40004/value"
@@ -5,6 +5,7 @@ and myUplink API operations using mock data and sessions.
 """
 
 import json
+import os
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -16,6 +17,7 @@ from myuplink2mqtt.utils.myuplink_utils import (
     get_device_brands,
     get_device_details,
     get_device_points,
+    get_devices_data,
     get_manufacturer,
     get_parameter_display_name,
     get_systems,
@@ -40,7 +42,7 @@ class TestLoadConfig:
             mock_config: Mock config data fixture.
         """
         config_file = tmp_path / "config.json"
-        config_file.write_text(json.dumps(mock_config))
+        config_file.write_text(json.dumps(dict(mock_config)))
 
         with patch("myuplink2mqtt.utils.myuplink_utils.CONFIG_FILENAME", str(config_file)):
             client_id, client_secret = load_config()
@@ -75,7 +77,7 @@ class TestLoadConfig:
             mock_config: Mock config data fixture.
         """
         config_file = tmp_path / "config.json"
-        config_file.write_text(json.dumps(mock_config))
+        config_file.write_text(json.dumps(dict(mock_config)))
 
         env_vars = {
             "MYUPLINK_CLIENT_ID": "env_override_id",
@@ -136,7 +138,7 @@ class TestTokenSaver:
         token_file = tmp_path / "token.json"
 
         with patch("myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", str(token_file)):
-            token_saver(mock_oauth_token)
+            token_saver(dict(mock_oauth_token))
 
         # Verify file was written
         assert token_file.exists()
@@ -157,11 +159,30 @@ class TestTokenSaver:
         token_file.write_text(json.dumps(old_token))
 
         with patch("myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", str(token_file)):
-            token_saver(mock_oauth_token)
+            token_saver(dict(mock_oauth_token))
 
         saved_token = json.loads(token_file.read_text())
         assert saved_token == mock_oauth_token
 
+    def test_token_saver_keeps_old_token_on_failure(self, tmp_path, mock_oauth_token):
+        """Test that a failed write leaves the previous token file intact.
+
+        Args:
+            tmp_path: pytest temporary directory.
+            mock_oauth_token: Mock OAuth token fixture.
+        """
+        token_file = tmp_path / "token.json"
+        old_token = {"access_token": "old_token"}
+        token_file.write_text(json.dumps(old_token))
+
+        with patch("myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", str(token_file)), patch(
+            "myuplink2mqtt.utils.myuplink_utils.os.fsync", side_effect=OSError("disk full")
+        ), pytest.raises(OSError):
+            token_saver(dict(mock_oauth_token))
+
+        assert json.loads(token_file.read_text()) == old_token
+        assert list(tmp_path.iterdir()) == [token_file]
+
 
 class TestLoadOauthToken:
     """Test suite for load_oauth_token function."""
@@ -174,7 +195,7 @@ class TestLoadOauthToken:
             mock_oauth_token: Mock OAuth token fixture.
         """
         token_file = tmp_path / "token.json"
-        token_file.write_text(json.dumps(mock_oauth_token))
+        token_file.write_text(json.dumps(dict(mock_oauth_token)))
 
         with patch("myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", str(token_file)):
             token = load_oauth_token()
@@ -200,6 +221,33 @@ class TestLoadOauthToken:
             with pytest.raises(json.JSONDecodeError):
                 load_oauth_token()
 
+    def test_load_oauth_token_rereads_changed_file(self, tmp_path, mock_oauth_token):
+        """Test that an unchanged token file is parsed once and edits are picked up.
+
+        Args:
+            tmp_path: pytest temporary directory.
+            mock_oauth_token: Mock OAuth token fixture.
+        """
+        token_file = tmp_path / "token.json"
+        token_file.write_text(json.dumps(dict(mock_oauth_token)))
+
+        with patch("myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", str(token_file)), patch(
+            "myuplink2mqtt.utils.myuplink_utils.load", wraps=json.load
+        ) as mock_load:
+            first = load_oauth_token()
+            second = load_oauth_token()
+            assert mock_load.call_count == 1
+            assert first == second
+            assert first is not second
+
+            refreshed = dict(mock_oauth_token, access_token="refreshed")
+            token_file.write_text(json.dumps(refreshed))
+            stat = token_file.stat()
+            os.utime(token_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            assert load_oauth_token() == refreshed
+            assert mock_load.call_count == 2
+
 
 # ============================================================================
 # Tests for OAuth Prerequisites
@@ -239,7 +287,7 @@ class TestCheckOauthPrerequisites:
             mock_config: Mock config data fixture.
         """
         config_file = tmp_path / "config.json"
-        config_file.write_text(json.dumps(mock_config))
+        config_file.write_text(json.dumps(dict(mock_config)))
 
         with patch("myuplink2mqtt.utils.myuplink_utils.CONFIG_FILENAME", str(config_file)), patch(
             "myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", "/nonexistent/token.json"
@@ -265,12 +313,111 @@ class TestCreateOauthSession:
         Args:
             patch_config_paths: Config path patching fixture.
         """
-        with patch("myuplink2mqtt.utils.myuplink_utils.OAuth2Session") as mock_oauth2:
+        with patch("myuplink2mqtt.utils.myuplink_utils._OAuth2Session") as mock_oauth2:
             session = create_oauth_session()
 
         assert session is not None
         mock_oauth2.assert_called_once()
 
+    def test_create_oauth_session_mounts_pooled_adapter(self, patch_config_paths):
+        """Test that the session pool fits the concurrent device fetches.
+
+        Args:
+            patch_config_paths: Config path patching fixture.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import DEVICE_FETCH_WORKERS
+
+        session = create_oauth_session()
+        adapter = session.get_adapter("https://api.myuplink.com/v2/systems/me")
+
+        assert adapter._pool_maxsize >= DEVICE_FETCH_WORKERS
+        assert adapter.max_retries.total > 0
+        assert "POST" not in adapter.max_retries.allowed_methods
+
+    def test_create_oauth_session_refreshes_once_across_threads(self, patch_config_paths):
+        """Test that concurrent requests with an expired token refresh it only once.
+
+        Args:
+            patch_config_paths: Config path patching fixture.
+        """
+        import threading
+        import time
+
+        from requests_oauthlib import OAuth2Session
+
+        session = create_oauth_session()
+        session.token = {
+            "access_token": "old",
+            "token_type": "Bearer",
+            "expires_at": time.time() - 10,
+        }
+
+        def refresh(token_url, refresh_token=None, **kwargs):
+            time.sleep(0.05)
+            session.token = {
+                "access_token": "new",
+                "token_type": "Bearer",
+                "expires_at": time.time() + 3600,
+            }
+            return session.token
+
+        threads = [
+            threading.Thread(target=session.refresh_token, args=(session.auto_refresh_url,))
+            for _ in range(4)
+        ]
+        with patch.object(OAuth2Session, "refresh_token", side_effect=refresh) as parent_refresh:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        parent_refresh.assert_called_once()
+        assert session.token["access_token"] == "new"
+
+    def test_create_oauth_session_saves_refreshed_token_once(self, patch_config_paths):
+        """Test that concurrent requests with an expired token save the new token once.
+
+        Args:
+            patch_config_paths: Config path patching fixture.
+        """
+        import threading
+        import time
+
+        import requests
+        from requests_oauthlib import OAuth2Session
+
+        with patch("myuplink2mqtt.utils.myuplink_utils.token_saver") as mock_saver:
+            session = create_oauth_session()
+        session.token = {
+            "access_token": "old",
+            "token_type": "Bearer",
+            "expires_at": time.time() - 10,
+        }
+
+        def refresh(token_url, refresh_token=None, **kwargs):
+            time.sleep(0.05)
+            session.token = {
+                "access_token": "new",
+                "token_type": "Bearer",
+                "expires_at": time.time() + 3600,
+            }
+            return session.token
+
+        threads = [
+            threading.Thread(target=session.get, args=("https://api.myuplink.com/v2/systems/me",))
+            for _ in range(4)
+        ]
+        with patch.object(OAuth2Session, "refresh_token", side_effect=refresh), patch.object(
+            requests.Session, "request"
+        ) as mock_request:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_request.call_count == 4
+        mock_saver.assert_called_once_with(session.token)
+
     def test_create_oauth_session_missing_credentials(self):
         """Test OAuth session creation fails without credentials."""
         with patch("myuplink2mqtt.utils.myuplink_utils.load_config", return_value=(None, None)):
@@ -285,7 +432,7 @@ class TestCreateOauthSession:
             mock_config: Mock config data fixture.
         """
         config_file = tmp_path / "config.json"
-        config_file.write_text(json.dumps(mock_config))
+        config_file.write_text(json.dumps(dict(mock_config)))
 
         with patch("myuplink2mqtt.utils.myuplink_utils.CONFIG_FILENAME", str(config_file)), patch(
             "myuplink2mqtt.utils.myuplink_utils.TOKEN_FILENAME", "/nonexistent/token.json"
@@ -382,6 +529,17 @@ class TestGetDeviceDetails:
         assert details["product"]["name"] == "IVT GEO 6"
         assert details["product"]["brand"] == "IVT"
 
+    def test_get_device_details_returns_response(self, mock_oauth_session, mock_device_details):
+        """Test that each device's details are returned as the API sent them.
+
+        Args:
+            mock_oauth_session: Mock OAuth session fixture.
+            mock_device_details: Parametrized mock device details fixture.
+        """
+        details = get_device_details(mock_oauth_session, mock_device_details["id"])
+
+        assert details == mock_device_details
+
     def test_get_device_details_api_error(self, mock_oauth_session_with_errors):
         """Test device details retrieval handles API errors.
 
@@ -443,6 +601,74 @@ class TestGetDevicePoints:
 
         assert points is not None
 
+    def test_get_device_points_query_string(self, mock_oauth_session):
+        """Test that parameters and language are encoded into the request URL.
+
+        The OAuth session forwards request keyword arguments such as params to
+        the token refresh request, so the query string must be part of the URL.
+
+        Args:
+            mock_oauth_session: Mock OAuth session fixture.
+        """
+        get_device_points(mock_oauth_session, "device-001", parameters=["40004", "40012"])
+
+        args, kwargs = mock_oauth_session.get.call_args
+        assert args[0].endswith(
+            "/v2/devices/device-001/points?parameters=40004,40012&language=en-US"
+        )
+        assert "params" not in kwargs
+
+    def test_get_device_points_query_string_encodes_values(self, mock_oauth_session):
+        """Test that query values are URL-encoded and empty ones left out.
+
+        Args:
+            mock_oauth_session: Mock OAuth session fixture.
+        """
+        get_device_points(mock_oauth_session, "device-001", language="sv SE&x=1")
+        get_device_points(mock_oauth_session, "device-001", language=None)
+
+        urls = [call.args[0] for call in mock_oauth_session.get.call_args_list]
+        assert urls[0].endswith("/points?language=sv+SE%26x%3D1")
+        assert urls[1].endswith("/v2/devices/device-001/points")
+
+    def test_get_device_points_token_refresh_body(self, patch_config_paths):
+        """Test that an automatic token refresh does not receive the query parameters.
+
+        Args:
+            patch_config_paths: Config path patching fixture.
+        """
+        import time
+
+        import requests
+
+        with patch("myuplink2mqtt.utils.myuplink_utils.token_saver"):
+            session = create_oauth_session()
+        session.token = {
+            "access_token": "old",
+            "refresh_token": "refresh",
+            "token_type": "Bearer",
+            "expires_at": time.time() - 10,
+        }
+
+        def mock_request(method, url, **kwargs):
+            response = Mock(status_code=200, headers={})
+            if method == "POST":
+                response.text = json.dumps(
+                    {"access_token": "new", "token_type": "Bearer", "expires_in": 3600}
+                )
+            else:
+                response.json.return_value = []
+            return response
+
+        with patch.object(requests.Session, "request", side_effect=mock_request) as request:
+            assert get_device_points(session, "device-001", parameters=["40004"]) == []
+
+        refresh_call, points_call = request.call_args_list
+        assert refresh_call.args[0] == "POST"
+        assert refresh_call.kwargs["data"]["grant_type"] == "refresh_token"
+        assert "params" not in refresh_call.kwargs["data"]
+        assert points_call.args[1].endswith("/points?parameters=40004&language=en-US")
+
     def test_get_device_points_api_error(self, mock_oauth_session_with_errors):
         """Test device points retrieval handles API errors.
 
@@ -463,6 +689,134 @@ class TestGetDevicePoints:
         assert points is None
 
 
+class TestConditionalGet:
+    """Test suite for ETag revalidation of device requests."""
+
+    @staticmethod
+    def _etag_response(body, etag='"v1"'):
+        """Build a 200 response carrying an ETag.
+
+        Args:
+            body: JSON body of the response.
+            etag: ETag header value.
+
+        Returns:
+            Mock: Mocked response.
+        """
+        response = Mock(status_code=200, headers={"ETag": etag})
+        response.json.return_value = body
+        response.content = json.dumps(body).encode("utf-8")
+        return response
+
+    def test_not_modified_returns_copy_of_previous_body(self):
+        """Test that a 304 answer returns a fresh copy of the previous body."""
+        mock_session = MagicMock()
+        mock_session.get.side_effect = [
+            self._etag_response([{"parameterId": "40004", "value": 1.5}]),
+            Mock(status_code=304, headers={}),
+        ]
+
+        points = get_device_points(mock_session, "device-001")
+        points[0]["value"] = 99
+        cached_points = get_device_points(mock_session, "device-001")
+
+        assert cached_points == [{"parameterId": "40004", "value": 1.5}]
+        assert cached_points is not points
+        assert mock_session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_without_etag_sends_no_condition(self):
+        """Test that responses without an ETag are not revalidated."""
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"id": "device-001"}
+        mock_session = MagicMock()
+        mock_session.get.return_value = response
+
+        get_device_details(mock_session, "device-001")
+        get_device_details(mock_session, "device-001")
+
+        assert mock_session.get.call_args.kwargs["headers"] is None
+
+    def test_etags_are_kept_per_session(self):
+        """Test that an ETag seen by one session is not sent by another."""
+        first_session = MagicMock()
+        first_session.get.return_value = self._etag_response({"id": "device-001"})
+        second_session = MagicMock()
+        second_session.get.return_value = self._etag_response({"id": "device-001"}, '"v2"')
+
+        get_device_details(first_session, "device-001")
+        get_device_details(second_session, "device-001")
+        get_device_details(first_session, "device-001")
+
+        assert second_session.get.call_args.kwargs["headers"] is None
+        assert first_session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_cache_is_dropped_with_session(self):
+        """Test that a session's cached bodies are released with the session."""
+        import gc
+
+        from myuplink2mqtt.utils import myuplink_utils
+
+        mock_session = MagicMock()
+        mock_session.get.return_value = self._etag_response({"id": "device-001"})
+        get_device_details(mock_session, "device-001")
+        assert mock_session in myuplink_utils._ETAG_CACHES
+
+        gc.collect()
+        cached_sessions = len(myuplink_utils._ETAG_CACHES)
+        del mock_session
+        gc.collect()
+
+        assert len(myuplink_utils._ETAG_CACHES) == cached_sessions - 1
+
+    def test_cache_drops_oldest_entry_when_full(self):
+        """Test that the ETag cache stays within ETAG_CACHE_SIZE."""
+        from myuplink2mqtt.utils import myuplink_utils
+
+        mock_session = MagicMock()
+        mock_session.get.return_value = self._etag_response({"id": "device"})
+
+        with patch.object(myuplink_utils, "ETAG_CACHE_SIZE", 2):
+            for device_id in ("device-001", "device-002", "device-003"):
+                get_device_details(mock_session, device_id)
+
+        assert list(myuplink_utils._ETAG_CACHES[mock_session]) == [
+            f"{myuplink_utils.MYUPLINK_API_BASE}/v2/devices/device-002",
+            f"{myuplink_utils.MYUPLINK_API_BASE}/v2/devices/device-003",
+        ]
+
+
+class TestGetDevicesData:
+    """Test suite for get_devices_data function."""
+
+    def test_get_devices_data_keeps_order(
+        self, mock_oauth_session, mock_device_details_nibe, mock_device_details_ivt
+    ):
+        """Test that details and points are returned per device in request order.
+
+        Args:
+            mock_oauth_session: Mock OAuth session fixture.
+            mock_device_details_nibe: Nibe device details fixture.
+            mock_device_details_ivt: IVT device details fixture.
+        """
+        results = get_devices_data(mock_oauth_session, ["device-002", "device-001"])
+
+        assert [details for details, _points in results] == [
+            mock_device_details_ivt,
+            mock_device_details_nibe,
+        ]
+        assert all(points is not None for _details, points in results)
+
+    def test_get_devices_data_api_error(self, mock_oauth_session_with_errors):
+        """Test that failed requests are reported as None.
+
+        Args:
+            mock_oauth_session_with_errors: Mock session with errors fixture.
+        """
+        results = get_devices_data(mock_oauth_session_with_errors, ["device-001"])
+
+        assert results == [(None, None)]
+
+
 # ============================================================================
 # Tests for Device Brands
 # ============================================================================
@@ -544,6 +898,13 @@ class TestGetManufacturer:
 
         assert manufacturer == "Unknown"
 
+    def test_get_manufacturer_name_without_space(self):
+        """Test that a product name without a space has an unknown manufacturer."""
+        device = {"product": {"name": "SingleWord"}}
+        manufacturer = get_manufacturer(device)
+
+        assert manufacturer == "Unknown"
+
     def test_get_manufacturer_missing_product(self):
         """Test manufacturer extraction handles missing product info."""
         device = {}
@@ -616,6 +977,31 @@ class TestFormatParameterValue:
         assert formatted == "21.5 °C"
 
 
+class TestCleanParameterName:
+    """Test suite for clean_parameter_name function."""
+
+    def test_strips_soft_hyphens_and_newlines(self):
+        """Test that soft hyphens, carriage returns and line feeds are removed."""
+        from myuplink2mqtt.utils.myuplink_utils import clean_parameter_name
+
+        assert clean_parameter_name("Heat\u00ad pump\r\n  flow") == "Heat pump flow"
+
+    def test_empty_name(self):
+        """Test that empty names are returned unchanged."""
+        from myuplink2mqtt.utils.myuplink_utils import clean_parameter_name
+
+        assert clean_parameter_name("") == ""
+
+    def test_repeated_names_are_cached(self):
+        """Test that cleaning a name seen before is served from the cache."""
+        from myuplink2mqtt.utils.myuplink_utils import clean_parameter_name
+
+        clean_parameter_name("Cached\u00ad name")
+        hits = clean_parameter_name.cache_info().hits
+        assert clean_parameter_name("Cached\u00ad name") == "Cached name"
+        assert clean_parameter_name.cache_info().hits == hits + 1
+
+
 # ============================================================================
 # Tests for Parameter Display Name
 # ============================================================================
@@ -863,26 +1249,18 @@ class TestApiAvailability:
 
         from myuplink2mqtt.utils.myuplink_utils import test_api_availability
 
-        with patch(
-            "myuplink2mqtt.utils.myuplink_utils.aiohttp.ClientSession"
-        ) as mock_session_class:
-            with patch("myuplink2mqtt.utils.myuplink_utils.Auth"):
-                with patch("myuplink2mqtt.utils.myuplink_utils.MyUplinkAPI") as mock_api_class:
-                    # Mock the async context manager
-                    mock_session = AsyncMock()
-                    mock_session_class.return_value.__aenter__.return_value = mock_session
-                    mock_session_class.return_value.__aexit__.return_value = None
-
-                    # Mock the async_ping to return True
-                    mock_api = AsyncMock()
-                    mock_api.async_ping = AsyncMock(return_value=True)
-                    mock_api_class.return_value = mock_api
-
-                    # Call the function
-                    result = await test_api_availability()
-
-                    # Verify result
-                    assert result is True
+        with patch("myuplink2mqtt.utils.myuplink_utils.Auth"):
+            with patch("myuplink2mqtt.utils.myuplink_utils.MyUplinkAPI") as mock_api_class:
+                # Mock the async_ping to return True
+                mock_api = AsyncMock()
+                mock_api.async_ping = AsyncMock(return_value=True)
+                mock_api_class.return_value = mock_api
+
+                # Call the function
+                result = await test_api_availability(AsyncMock())
+
+                # Verify result
+                assert result is True
 
     @pytest.mark.asyncio
     async def test_api_availability_connection_error(self):
@@ -891,28 +1269,61 @@ class TestApiAvailability:
 
         from myuplink2mqtt.utils.myuplink_utils import test_api_availability
 
-        with patch(
-            "myuplink2mqtt.utils.myuplink_utils.aiohttp.ClientSession"
-        ) as mock_session_class:
-            with patch("myuplink2mqtt.utils.myuplink_utils.Auth"):
-                with patch("myuplink2mqtt.utils.myuplink_utils.MyUplinkAPI") as mock_api_class:
-                    # Mock the async context manager
-                    mock_session = AsyncMock()
-                    mock_session_class.return_value.__aenter__.return_value = mock_session
-                    mock_session_class.return_value.__aexit__.return_value = None
+        with patch("myuplink2mqtt.utils.myuplink_utils.Auth"):
+            with patch("myuplink2mqtt.utils.myuplink_utils.MyUplinkAPI") as mock_api_class:
+                # Mock the async_ping to raise an error
+                mock_api = AsyncMock()
+                mock_api.async_ping = AsyncMock(
+                    side_effect=aiohttp.ClientError("Connection failed")
+                )
+                mock_api_class.return_value = mock_api
+
+                # Call the function
+                result = await test_api_availability(AsyncMock())
+
+                # Should return False on error
+                assert result is False
+
+    @pytest.mark.asyncio
+    async def test_api_availability_reuses_shared_session(self):
+        """Test that repeated pings share one session until it is closed."""
+        from myuplink2mqtt.utils.myuplink_utils import close_session, test_api_availability
+
+        with patch("myuplink2mqtt.utils.myuplink_utils.Auth") as mock_auth_class, patch(
+            "myuplink2mqtt.utils.myuplink_utils.MyUplinkAPI"
+        ) as mock_api_class:
+            mock_api = AsyncMock()
+            mock_api.async_ping = AsyncMock(return_value=True)
+            mock_api_class.return_value = mock_api
+
+            try:
+                await test_api_availability()
+                await test_api_availability()
+            finally:
+                await close_session()
+
+            first_session = mock_auth_class.call_args_list[0].args[0]
+            second_session = mock_auth_class.call_args_list[1].args[0]
+            assert first_session is second_session
+            assert first_session.closed
+
+    def test_get_session_closes_session_of_previous_loop(self):
+        """Test that a session left over from another event loop is closed."""
+        import asyncio
 
-                    # Mock the async_ping to raise an error
-                    mock_api = AsyncMock()
-                    mock_api.async_ping = AsyncMock(
-                        side_effect=aiohttp.ClientError("Connection failed")
-                    )
-                    mock_api_class.return_value = mock_api
+        from myuplink2mqtt.utils.myuplink_utils import close_session, get_session
 
-                    # Call the function
-                    result = await test_api_availability()
+        async def get_and_close():
+            try:
+                return await get_session()
+            finally:
+                await close_session()
 
-                    # Should return False on error
-                    assert result is False
+        first_session = asyncio.run(get_session())
+        second_session = asyncio.run(get_and_close())
+
+        assert first_session is not second_session
+        assert first_session.closed
 
 
 # ============================================================================
@@ -968,6 +1379,18 @@ class TestExtractModel:
         assert extract_model("") == ""
 
 
+class TestSplitProductName:
+    """Test suite for split_product_name function."""
+
+    def test_split_product_name(self):
+        """Test splitting product names into manufacturer and model."""
+        from myuplink2mqtt.utils.myuplink_utils import split_product_name
+
+        assert split_product_name("IVT Greenline HT Plus") == ("IVT", "Greenline HT Plus")
+        assert split_product_name("SingleWord") == ("Unknown", "SingleWord")
+        assert split_product_name("") == ("Unknown", "")
+
+
 class TestAddAutoDiscoveryToPoints:
     """Test suite for add_auto_discovery_to_points function."""
 
@@ -1049,3 +1472,161 @@ class TestAddAutoDiscoveryToPoints:
         # Auto discovery should still be added (might be None on error)
         assert "autoDiscovery" in points_data[0]
 
+
+class TestSaveApiDataToFile:
+    """Test suite for save_api_data_to_file function."""
+
+    def test_save_api_data_to_file(self, tmp_path, mock_systems_response, mock_device_details_nibe):
+        """Test that every system's devices are fetched and written in order.
+
+        Args:
+            tmp_path: pytest temporary directory.
+            mock_systems_response: Systems endpoint response fixture.
+            mock_device_details_nibe: Nibe device details fixture.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import save_api_data_to_file
+
+        def mock_get(url, *args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            if url.endswith("/v2/systems/me"):
+                response.json.return_value = mock_systems_response
+            elif "/points" in url:
+                response.json.return_value = [
+                    {"parameterId": "40004", "parameterName": "Outdoor­ temp", "value": 1.5}
+                ]
+            else:
+                response.json.return_value = mock_device_details_nibe
+            return response
+
+        mock_session = MagicMock()
+        mock_session.get.side_effect = mock_get
+        output_file = tmp_path / "api_data.json"
+
+        assert save_api_data_to_file(mock_session, str(output_file)) is True
+
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+        device_ids = [[device["id"] for device in system["devices"]] for system in data["systems"]]
+        assert device_ids == [["device-001", "device-002"], ["device-003"]]
+        point = data["systems"][0]["devices"][0]["dataPoints"][0]
+        assert point["parameterName"] == "Outdoor temp"
+        assert "autoDiscovery" in point
+
+    def test_save_api_data_to_file_matches_json_dump(
+        self, tmp_path, mock_systems_response, mock_device_details_nibe
+    ):
+        """Test that the export is written like json.dump(indent=2) and the temp file is removed.
+
+        Args:
+            tmp_path: pytest temporary directory.
+            mock_systems_response: Systems endpoint response fixture.
+            mock_device_details_nibe: Nibe device details fixture.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import save_api_data_to_file
+
+        def mock_get(url, *args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            if url.endswith("/v2/systems/me"):
+                response.json.return_value = mock_systems_response
+            elif "/points" in url:
+                response.json.return_value = [
+                    {
+                        "parameterId": "40004",
+                        "parameterName": "Temp",
+                        "value": 1,
+                        "parameterUnit": "°C",
+                    },
+                    {"parameterId": "47137", "parameterName": "Mode", "value": 0, "enumValues": []},
+                ]
+            else:
+                response.json.return_value = mock_device_details_nibe
+            return response
+
+        mock_session = MagicMock()
+        mock_session.get.side_effect = mock_get
+        output_file = tmp_path / "api_data.json"
+
+        assert save_api_data_to_file(mock_session, str(output_file)) is True
+
+        text = output_file.read_text(encoding="utf-8")
+        data = json.loads(text)
+        assert [system["systemId"] for system in data["systems"]] == ["system-123", "system-456"]
+        assert '"parameterUnit": "°C"' in text
+        assert '"enumValues": []' in text
+        assert text == json.dumps(data, indent=2, ensure_ascii=False)
+        assert not (tmp_path / "api_data.json.tmp").exists()
+
+    def test_save_api_data_to_file_without_product(self, tmp_path, mock_systems_response):
+        """Test that devices without product details are still exported.
+
+        Args:
+            tmp_path: pytest temporary directory.
+            mock_systems_response: Systems endpoint response fixture.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import save_api_data_to_file
+
+        def mock_get(url, *args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            if url.endswith("/v2/systems/me"):
+                response.json.return_value = mock_systems_response
+            elif "/points" in url:
+                response.json.return_value = [
+                    {"parameterId": "40004", "parameterName": "Temp", "value": 1}
+                ]
+            else:
+                response.json.return_value = {"id": url.rsplit("/", 1)[-1], "product": None}
+            return response
+
+        mock_session = MagicMock()
+        mock_session.get.side_effect = mock_get
+        output_file = tmp_path / "api_data.json"
+
+        assert save_api_data_to_file(mock_session, str(output_file)) is True
+
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+        device = data["systems"][0]["devices"][0]
+        assert device["product"] == {}
+        assert device["dataPoints"][0]["autoDiscovery"]["device"]["manufacturer"] == "Unknown"
+
+    def test_save_api_data_to_file_no_systems(self, tmp_path):
+        """Test that an account without systems writes an empty systems list.
+
+        Args:
+            tmp_path: pytest temporary directory.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import save_api_data_to_file
+
+        mock_session = MagicMock()
+        mock_session.get.return_value.status_code = 200
+        mock_session.get.return_value.json.return_value = {"systems": []}
+        output_file = tmp_path / "api_data.json"
+
+        assert save_api_data_to_file(mock_session, str(output_file)) is True
+        assert output_file.read_text(encoding="utf-8") == json.dumps({"systems": []}, indent=2)
+
+    def test_save_api_data_to_file_failed_write_keeps_previous_file(self, tmp_path):
+        """Test that a failed write leaves the previous export untouched.
+
+        Args:
+            tmp_path: pytest temporary directory.
+        """
+        from myuplink2mqtt.utils.myuplink_utils import save_api_data_to_file
+
+        mock_session = MagicMock()
+        mock_session.get.return_value.status_code = 200
+        mock_session.get.return_value.json.return_value = {"systems": []}
+        output_file = tmp_path / "api_data.json"
+        output_file.write_text("previous", encoding="utf-8")
+
+        with patch(
+            "myuplink2mqtt.utils.myuplink_utils.os.replace", side_effect=OSError("disk full")
+        ):
+            assert save_api_data_to_file(mock_session, str(output_file)) is False
+
+        assert output_file.read_text(encoding="utf-8") == "previous"
+        assert not (tmp_path / "api_data.json.tmp").exists()